@@ -1,17 +1,20 @@
 """
-Last Modified: May 14, 2024
+Last Modified: October 16, 2026
 """
 
 from os.path import join
 
 from qtpy.QtWidgets import QApplication
 
-from physqgen.admin import AdminView
+from physqgen.admin import DATABASEPATH, AdminView
+from physqgen.database import migrateDatabase
 from physqgen.generator.config import registerConfig
 
 
 def runAdminApp() -> None:
     registerConfig(join(".", "configs"))
+    # upgrade databases made by older versions in place, keeping their data
+    migrateDatabase(DATABASEPATH)
     # import config after creating it
     from physqgen.generator.config.session import appConfig
 
@@ -0,0 +1,68 @@
+"""
+Last Modified: October 16, 2026
+
+Compares the time taken to write a newly logged in Session to the database one row (and commit) at a time against Session.addToDatabase.
+"""
+from os.path import join
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from physqgen.database import (closeConnections, closeDatabaseWriter,
+                               createDatabase, executeOnDatabase, uuidBlob)
+from physqgen.generator.config import registerConfig
+from physqgen.generator.question import Question
+from physqgen.session import LoginInfo, Session
+
+# the questions in the active config are cycled through until each session has this many
+QUESTIONS_PER_SESSION = 12
+LOGINS = 200
+
+
+def addToDatabaseRowByRow(sess: Session) -> None:
+    """The old write path: the Session, every Question and every Variable are inserted and committed separately."""
+    sql = '''INSERT INTO SESSIONS (SESSION_UUID, FIRST_NAME, LAST_NAME, EMAIL) VALUES (?, ?, ?, ?)'''
+    replacements = (uuidBlob(sess.uuid), sess.loginInfo.firstName, sess.loginInfo.lastName, sess.loginInfo.email)
+    executeOnDatabase(sess.databasePath, sql, replacements)
+
+    sql = '''
+        INSERT INTO QUESTIONS (
+            QUESTION_UUID, SESSION_UUID, TEMPLATE_ID, NUMBER_TRIES, CORRECT, ACTIVE, ANSWER, SEED
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    '''
+    for question in sess.questions:
+        executeOnDatabase(sess.databasePath, sql, question.databaseRow(sess.uuid, Question.templateIds(sess.databasePath, [question])[0]))
+        for variable in question.variables:
+            variable.addToDatabase(sess.databasePath, question.uuid)
+    return
+
+def timeLogins(databasePath: str, config, addFunction) -> float:
+    """Returns the average milliseconds taken by addFunction to write one new Session."""
+    questionConfigs = config.questionConfigs
+    total = 0.0
+    for _ in range(LOGINS):
+        sess = Session(
+            databasePath,
+            LoginInfo("First", "Last", "first.last@example.com"),
+            questions=[questionConfigs[index % len(questionConfigs)].getRandomQuestion() for index in range(QUESTIONS_PER_SESSION)]
+        )
+        sess.setNewActiveQuestion()
+
+        start = perf_counter()
+        addFunction(sess)
+        total += perf_counter() - start
+
+    return total / LOGINS * 1000
+
+if __name__ == "__main__":
+    config = registerConfig(join(".", "configs"))
+
+    # waits for the queued write, so both are timed until the Session is stored
+    for name, addFunction in (("row by row", addToDatabaseRowByRow), ("Session.addToDatabase", lambda sess: sess.addToDatabase().result())):
+        with TemporaryDirectory() as folder:
+            databasePath = join(folder, "benchmark.db")
+            createDatabase(databasePath)
+            print(f"{name}: {timeLogins(databasePath, config, addFunction):.3f} ms per login ({QUESTIONS_PER_SESSION} questions)")
+            # nothing can be left to write when the folder is deleted, or to flush when exiting
+            closeDatabaseWriter(databasePath)
+            # the pooled connections have to be closed before the folder can be deleted on Windows
+            closeConnections()
@@ -0,0 +1,48 @@
+"""
+Last Modified: October 16, 2026
+
+Measures how many times per second KinematicsQuestion can solve for each answer variable, from each set of three known variables.
+Both the question properties and the Solver picked once per configuration (as used during generation) are timed.
+"""
+from itertools import combinations
+from timeit import Timer
+
+from physqgen.generator import KinematicsQuestion, Variable
+from physqgen.generator.solvers import getSolver
+
+# a consistent set of values, so every formula has a real solution
+# v2 = v1 + at, d = v1t + at^2/2
+VALUES = {
+    "initial_velocity": 2.0,
+    "acceleration": 3.0,
+    "time": 4.0,
+    "final_velocity": 14.0,
+    "displacement": 32.0
+}
+SOLVES = 20000
+
+
+def solvesPerSecond(answerVariableName: str, knownVariableNames: tuple[str, ...]) -> tuple[float, float]:
+    """Returns how many times per second the answerVariableName property, and the Solver for this combination, can solve from the knownVariableNames."""
+    question = KinematicsQuestion(
+        answerVariableName=answerVariableName,
+        variables=[Variable(variableName=name, value=VALUES[name]) for name in knownVariableNames],
+        correctLeeway=0.1,
+        text="",
+        imageFilename=""
+    )
+    # best of three to ignore interruptions
+    propertySeconds = min(Timer(lambda: getattr(question, answerVariableName)).repeat(3, SOLVES))
+
+    solver = getSolver(question.questionType, frozenset(knownVariableNames), answerVariableName)
+    values = {name: VALUES[name] for name in knownVariableNames}
+    solverSeconds = min(Timer(lambda: solver(values)).repeat(3, SOLVES))
+
+    return SOLVES / propertySeconds, SOLVES / solverSeconds
+
+if __name__ == "__main__":
+    for answerVariableName in VALUES:
+        otherNames = [name for name in VALUES if name != answerVariableName]
+        for knownVariableNames in combinations(otherNames, 3):
+            propertyRate, solverRate = solvesPerSecond(answerVariableName, knownVariableNames)
+            print(f"{answerVariableName:>16} from {', '.join(knownVariableNames):<48} property {propertyRate:>12,.0f} solves/s, Solver {solverRate:>12,.0f} solves/s")
@@ -0,0 +1,73 @@
+"""
+Last Modified: October 16, 2026
+
+Compares the time taken to collect the admin app's student grid with a query per question (the old getStudentData) against getStudentData, for 1,000 students with 20 questions each.
+Also times getStudentDataSince when one student has submitted an answer since the last poll.
+"""
+from os.path import join
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from physqgen.admin.student_data import getStudentData, getStudentDataSince
+from physqgen.database import (closeConnections, createDatabase,
+                               executeOnDatabase, transaction)
+from physqgen.generator.config import registerConfig
+from physqgen.session import LoginInfo, Session
+
+# the questions in the active config are cycled through until each session has this many
+QUESTIONS_PER_SESSION = 20
+STUDENTS = 1000
+REPEATS = 5
+
+
+def getStudentDataPerQuestion(databasePath: str) -> dict[str, list[tuple[int, bool]]]:
+    """The old read path: every Question is loaded, then its Session is looked up with a separate query."""
+    studentQuestionInfo: dict = dict()
+    for row in executeOnDatabase(databasePath, "SELECT SESSION_UUID, NUMBER_TRIES, CORRECT FROM QUESTIONS"):
+        sessionResults = executeOnDatabase(databasePath, "SELECT FIRST_NAME, LAST_NAME, EMAIL FROM SESSIONS WHERE SESSION_UUID=?", (row[0],))
+        if len(sessionResults) == 0:
+            continue
+        sessionResults = sessionResults[0]
+        studentQuestionInfo.setdefault(f"{sessionResults[0]} {sessionResults[1]} ({sessionResults[2]})", []).append((row[1], row[2]))
+    return studentQuestionInfo
+
+def fillDatabase(databasePath: str, config) -> None:
+    """Stores STUDENTS logged in Sessions with QUESTIONS_PER_SESSION Questions each."""
+    questionConfigs = config.questionConfigs
+    with transaction(databasePath):
+        for student in range(STUDENTS):
+            sess = Session(
+                databasePath,
+                LoginInfo("First", f"Last{student}", f"student{student}@example.com"),
+                questions=[questionConfigs[index % len(questionConfigs)].getRandomQuestion() for index in range(QUESTIONS_PER_SESSION)]
+            )
+            sess.setNewActiveQuestion()
+            sess.writeToDatabase()
+    return
+
+def timeReads(databasePath: str, readFunction) -> float:
+    """Returns the average milliseconds taken by readFunction to collect the whole grid."""
+    start = perf_counter()
+    for _ in range(REPEATS):
+        readFunction(databasePath)
+    return (perf_counter() - start) / REPEATS * 1000
+
+if __name__ == "__main__":
+    config = registerConfig(join(".", "configs"))
+
+    with TemporaryDirectory() as folder:
+        databasePath = join(folder, "benchmark.db")
+        createDatabase(databasePath)
+        fillDatabase(databasePath, config)
+
+        if getStudentDataPerQuestion(databasePath) != getStudentData(databasePath):
+            raise AssertionError("getStudentData collected different data than the old read path.")
+
+        for name, readFunction in (("query per question", getStudentDataPerQuestion), ("getStudentData", getStudentData)):
+            print(f"{name}: {timeReads(databasePath, readFunction):.1f} ms per reload ({STUDENTS} students, {QUESTIONS_PER_SESSION} questions each)")
+
+        revision = getStudentDataSince(databasePath).revision
+        executeOnDatabase(databasePath, "UPDATE QUESTIONS SET NUMBER_TRIES=NUMBER_TRIES+1 WHERE rowid=(SELECT MAX(rowid) FROM QUESTIONS)")
+        print(f"getStudentDataSince: {timeReads(databasePath, lambda path: getStudentDataSince(path, revision)):.1f} ms per reload (1 student changed)")
+        # the pooled connections have to be closed before the folder can be deleted on Windows
+        closeConnections()
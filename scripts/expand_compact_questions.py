@@ -0,0 +1,18 @@
+"""
+Last Modified: October 16, 2026
+
+Rewrites every Question stored in compact form in data/data.db so it is stored with a row per Variable, as if compact storage was never used.
+Run this from the repository folder before changing or replacing a config that was used with "compactStorage", while the old config is still active.
+"""
+from os.path import join
+
+from physqgen.database import migrateDatabase
+from physqgen.generator.config import registerConfig
+from physqgen.generator.question import Question
+
+if __name__ == "__main__":
+    # the questions' Variables are drawn again from the active config
+    registerConfig(join(".", "configs"))
+    databasePath = join(".", "data", "data.db")
+    migrateDatabase(databasePath)
+    print(f"Expanded {Question.expandCompactInDatabase(databasePath)} compact questions.")
@@ -0,0 +1,23 @@
+"""
+Last Modified: October 16, 2026
+
+Re-grades all past work stored in data/data.db, for after a solver is fixed or a correctLeeway is changed in the active config.
+Run this from the repository folder while the server is stopped.
+"""
+from os.path import join
+from time import perf_counter
+
+from physqgen.database import migrateDatabase
+from physqgen.generator.config import registerConfig
+from physqgen.regrade import regradeDatabase
+
+if __name__ == "__main__":
+    # the leeways are taken from the active config, and compact questions are loaded with it
+    config = registerConfig(join(".", "configs"))
+    databasePath = join(".", "data", "data.db")
+    migrateDatabase(databasePath)
+
+    start = perf_counter()
+    summary = regradeDatabase(databasePath, config)
+    print(f"Re-graded in {perf_counter() - start:.2f} s.")
+    print(f"{summary.templates} question leeways, {summary.answers} answers, {summary.attempts} attempts and {summary.questions} questions changed.")
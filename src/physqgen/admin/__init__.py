@@ -1,2 +1,9 @@
 from .constants import DATABASEPATH
-from .qtapp import AdminView
+
+
+def __getattr__(name: str):
+    """Imports AdminView the first time it is used, so the command line reporter and the data functions never import Qt."""
+    if name == "AdminView":
+        from .qtapp import AdminView
+        return AdminView
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
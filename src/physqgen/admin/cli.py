@@ -0,0 +1,144 @@
+from argparse import ArgumentParser, Namespace
+from os import O_WRONLY, devnull, dup2
+from os import open as openDescriptor
+from os.path import isfile, join, splitext
+from sys import exit, stdout
+from time import sleep
+
+from colorama import just_fix_windows_console
+
+from physqgen.admin.constants import DATABASEPATH
+from physqgen.admin.export import EXPORT_FORMATS, exportGradebook
+from physqgen.admin.student_data import getStudentData, getStudentDataSince
+from physqgen.attempt import Attempt
+from physqgen.database import DataVersionWatcher, migrateDatabase
+from physqgen.generator import Config
+from physqgen.generator.config import registerConfig
+
+# moves the cursor to the top left and erases the terminal, to redraw in place
+CLEAR_SCREEN = "\033[H\033[J"
+
+
+def formatStudentTable(config: Config, studentData: dict[str, list[tuple[int, bool]]]) -> str:
+    """
+    Returns studentData (from getStudentData) as a plain text table, with a row per student and a column per question in config, like the admin app's grid.\n
+    Each cell contains the number of submissions and whether the question was completed.
+    """
+    # having these titles be correct relies on the questions being created in the same order
+    header = ["Student"] + [f"{question.questionType}: {question.answerVariableName}" for question in config.questionConfigs]
+    subheader = [""] + ["submissions, completed"] * len(config.questionConfigs)
+
+    rows = []
+    for name, questions in studentData.items():
+        cells = [f"{numberTries}, {'yes' if correct else 'no'}" for numberTries, correct in questions[:len(config.questionConfigs)]]
+        # stored before the config gained questions
+        cells.extend([""] * (len(config.questionConfigs) - len(cells)))
+        rows.append([name] + cells)
+
+    widths = [max(len(row[column]) for row in [header, subheader, *rows]) for column in range(len(header))]
+    lines = ["  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip() for row in [header, subheader, *rows]]
+
+    completed = sum(all(correct for _, correct in questions) for questions in studentData.values())
+    lines.append("")
+    lines.append(f"{len(studentData)} students, {completed} completed every question.")
+    return "\n".join(lines)
+
+def formatAttemptTable(attemptCounts: dict[str, tuple[int, int, int]]) -> str:
+    """Returns attemptCounts (from Attempt.countsByQuestionText) as a plain text table, with a row per configured question, most attempted first."""
+    header = ["Question", "Attempts", "Correct", "Students"]
+    rows = [
+        [text, str(attempts), str(correct), str(students)]
+        for text, (attempts, correct, students) in sorted(attemptCounts.items(), key=lambda item: item[1][0], reverse=True)
+    ]
+
+    widths = [max(len(row[column]) for row in [header, *rows]) for column in range(len(header))]
+    return "\n".join("  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip() for row in [header, *rows])
+
+def watch(config: Config, databasePath: str, interval: float) -> None:
+    """Redraws the table whenever the database changes, checking every interval seconds, until interrupted with ctrl+c. Only the changed students are read each time."""
+    # older Windows terminals need this to understand CLEAR_SCREEN, it does nothing elsewhere
+    just_fix_windows_console()
+    watcher = DataVersionWatcher(databasePath)
+    changes = getStudentDataSince(databasePath)
+    studentData = changes.students
+    try:
+        while True:
+            print(CLEAR_SCREEN + formatStudentTable(config, studentData), flush=True)
+            while not watcher.changed():
+                sleep(interval)
+
+            changes = getStudentDataSince(databasePath, changes.revision)
+            if changes.full:
+                studentData = changes.students
+            else:
+                # existing students keep their place, new ones are added at the end
+                studentData.update(changes.students)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+    return
+
+def report(arguments: Namespace) -> None:
+    """Prints or exports what the already validated arguments (from main) ask for."""
+    if arguments.export is not None:
+        # the export doesn't need the config, the questions' details are all stored
+        migrateDatabase(arguments.database)
+        if arguments.export == "-":
+            exportGradebook(arguments.database, stdout, arguments.format)
+            return
+        # newline="" as the csv module writes its own line endings
+        with open(arguments.export, "w", newline="", encoding="utf-8") as file:
+            count = exportGradebook(arguments.database, file, arguments.format)
+        print(f"Exported {count} questions to {arguments.export}.")
+        return
+
+    if arguments.attempts:
+        # question text is stored, so this doesn't need the config either
+        migrateDatabase(arguments.database)
+        print(formatAttemptTable(Attempt.countsByQuestionText(arguments.database)))
+        return
+
+    config = registerConfig(arguments.configs)
+    # upgrade databases made by older versions in place, keeping their data
+    migrateDatabase(arguments.database)
+
+    if arguments.watch is None:
+        print(formatStudentTable(config, getStudentData(arguments.database)))
+    else:
+        watch(config, arguments.database, arguments.watch)
+    return
+
+def main(arguments: list[str] | None = None) -> None:
+    """
+    Prints the student question data stored in the database as a table, once or whenever it changes. Imports no Qt, so it starts quickly and works without a display.\n
+    With --export, writes every student's results to a CSV or JSON Lines file instead. With --attempts, prints statistics about each question from the stored Attempts instead.
+    """
+    parser = ArgumentParser(prog="python -m physqgen.admin", description="Shows which questions each student has submitted and completed.")
+    parser.add_argument("--watch", nargs="?", type=float, const=1.0, metavar="SECONDS", help="keep the table up to date, checking for changes every SECONDS (default 1)")
+    parser.add_argument("--database", default=DATABASEPATH, help="path to the database (default: %(default)s)")
+    parser.add_argument("--configs", default=join(".", "configs"), help="folder containing active_config.json, for the column headers (default: %(default)s)")
+    parser.add_argument("--attempts", action="store_true", help="show how many times each question was attempted and answered correctly, and by how many students, instead")
+    parser.add_argument("--export", metavar="PATH", help="write every student's results for every question to PATH instead, - for standard output")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, help="format of --export, csv or JSON Lines (default: jsonl if PATH ends in .jsonl, otherwise csv)")
+    arguments = parser.parse_args(arguments)
+
+    # migrateDatabase would create a new, empty database, so a mistyped path would report no students instead of an error
+    if not isfile(arguments.database):
+        parser.error(f"no database at {arguments.database}")
+
+    if arguments.export is not None and arguments.format is None:
+        extension = splitext(arguments.export)[1].lower()
+        # JSON Lines isn't valid JSON, so a .json file would fail to open in anything expecting it
+        if extension == ".json":
+            parser.error("JSON Lines exports are not valid JSON, name the file .jsonl or pass --format")
+        arguments.format = "jsonl" if extension == ".jsonl" else "csv"
+
+    try:
+        report(arguments)
+    except BrokenPipeError:
+        # the reader of standard output, like head, closed it early
+        # point stdout at devnull, so flushing it while exiting doesn't raise again
+        dup2(openDescriptor(devnull, O_WRONLY), stdout.fileno())
+        exit(1)
+    return
@@ -0,0 +1,112 @@
+from csv import writer
+from json import dumps
+from typing import Iterator, TextIO
+from uuid import UUID
+
+from physqgen.database import iterateOnDatabase
+
+# the columns of the export, in order, and the keys of each JSON Lines object
+EXPORT_FIELDS = (
+    "firstName",
+    "lastName",
+    "email",
+    "sessionUUID",
+    "questionNumber",
+    "questionType",
+    "answerVariableName",
+    "text",
+    "numberTries",
+    "correct",
+    "answer",
+    "firstSubmittedAt",
+    "lastSubmittedAt",
+    "completedAt"
+)
+
+EXPORT_FORMATS = ("csv", "jsonl")
+
+
+def iterateGradebook(databasePath: str) -> Iterator[tuple]:
+    """
+    Yields a row with the EXPORT_FIELDS of every question given to a student, grouped by student in the order they logged in, and in the order the questions were given.\n
+    Rows are streamed from a single query, so the database can be any size. The timestamps come from the recorded Attempts, as "YYYY-MM-DD HH:MM:SS" text in local time,
+    and are None for questions answered before submissions were recorded, or that weren't.
+    """
+    # CROSS JOIN makes SESSIONS the outer loop, so the rows come out of the indexes already in order and are never sorted
+    # the Attempt timestamps are each one lookup in ATTEMPTS_QUESTION_UUID_INDEX, and are formatted by sqlite, which is much faster than datetime
+    sql = '''
+        SELECT
+            SESSIONS.FIRST_NAME,
+            SESSIONS.LAST_NAME,
+            SESSIONS.EMAIL,
+            SESSIONS.SESSION_UUID,
+            QUESTION_TEMPLATES.QUESTION_TYPE,
+            QUESTION_TEMPLATES.ANSWER_VARIABLE_NAME,
+            QUESTION_TEMPLATES.TEXT,
+            QUESTIONS.NUMBER_TRIES,
+            QUESTIONS.CORRECT,
+            QUESTIONS.ANSWER,
+            (SELECT DATETIME(MIN(SUBMITTED_AT), 'unixepoch', 'localtime') FROM ATTEMPTS WHERE ATTEMPTS.QUESTION_UUID=QUESTIONS.QUESTION_UUID),
+            (SELECT DATETIME(MAX(SUBMITTED_AT), 'unixepoch', 'localtime') FROM ATTEMPTS WHERE ATTEMPTS.QUESTION_UUID=QUESTIONS.QUESTION_UUID),
+            (SELECT DATETIME(MIN(SUBMITTED_AT), 'unixepoch', 'localtime') FROM ATTEMPTS WHERE ATTEMPTS.QUESTION_UUID=QUESTIONS.QUESTION_UUID AND ATTEMPTS.CORRECT)
+        FROM SESSIONS
+        CROSS JOIN QUESTIONS ON QUESTIONS.SESSION_UUID=SESSIONS.SESSION_UUID
+        JOIN QUESTION_TEMPLATES ON QUESTION_TEMPLATES.TEMPLATE_ID=QUESTIONS.TEMPLATE_ID
+        ORDER BY
+            SESSIONS.rowid,
+            QUESTIONS.rowid
+    '''
+    sessionUUID = None
+    for row in iterateOnDatabase(databasePath, sql):
+        # numbered from 1 within each student's Session, whose uuid is only converted once
+        if row[3] != sessionUUID:
+            sessionUUID = row[3]
+            sessionUUIDText = str(UUID(bytes=sessionUUID))
+            questionNumber = 0
+        questionNumber += 1
+
+        yield (
+            row[0],
+            row[1],
+            row[2],
+            sessionUUIDText,
+            questionNumber,
+            row[4],
+            row[5],
+            row[6],
+            row[7],
+            bool(row[8]),
+            row[9],
+            row[10],
+            row[11],
+            row[12]
+        )
+    return
+
+def writeCSV(rows: Iterator[tuple], file: TextIO) -> int:
+    """Writes a header and rows (from iterateGradebook) to file as CSV, one row at a time. Missing values are left empty. Returns the number of rows written."""
+    csvWriter = writer(file)
+    csvWriter.writerow(EXPORT_FIELDS)
+    count = 0
+    for row in rows:
+        csvWriter.writerow(row)
+        count += 1
+    return count
+
+def writeJSONLines(rows: Iterator[tuple], file: TextIO) -> int:
+    """Writes rows (from iterateGradebook) to file as JSON Lines, one object keyed by EXPORT_FIELDS per line. Missing values are null. Returns the number of rows written."""
+    count = 0
+    for row in rows:
+        file.write(dumps(dict(zip(EXPORT_FIELDS, row))))
+        file.write("\n")
+        count += 1
+    return count
+
+def exportGradebook(databasePath: str, file: TextIO, exportFormat: str = "csv") -> int:
+    """Streams every student's results for every question from the database to file, in exportFormat ("csv" or "jsonl"), with constant memory. Returns the number of rows written."""
+    if exportFormat not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format {exportFormat}, expected one of: {', '.join(EXPORT_FORMATS)}.")
+
+    if exportFormat == "csv":
+        return writeCSV(iterateGradebook(databasePath), file)
+    return writeJSONLines(iterateGradebook(databasePath), file)
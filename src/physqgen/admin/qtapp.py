@@ -1,12 +1,12 @@
-from os import remove
-
 from qtpy.QtCore import Qt, QTimer
-from qtpy.QtWidgets import (QAction, QFrame, QGridLayout, QLabel, QMainWindow,
-                            QToolBar, QVBoxLayout, QWidget)
+from qtpy.QtWidgets import (QAction, QHeaderView, QMainWindow, QTableView,
+                            QToolBar)
 
 from physqgen.admin import DATABASEPATH
-from physqgen.admin.student_data import getStudentData
-from physqgen.database import createDatabase
+from physqgen.admin.student_data import StudentDataChanges
+from physqgen.admin.student_loader import StudentDataLoader
+from physqgen.admin.student_model import StudentTableModel
+from physqgen.database import DataVersionWatcher, clearDatabase
 from physqgen.generator import Config
 
 
@@ -16,7 +16,9 @@ class AdminView(QMainWindow):
     Attributes:\n
         Inherits attributes from QMainWindow,\n
         widgets (dict): all app widgets,\n
-        _takeAtLocation (int): loop counter to know which widgets to remove when reloading,\n
+        model (StudentTableModel): the data shown in the table,\n
+        loader (StudentDataLoader): reads the data off the GUI thread,\n
+        watcher (DataVersionWatcher): detects changes to the database, so the timer only reloads after one,\n
         timer (QTimer): auto-reload timer
     """
     def __init__(self, config: Config) -> None:
@@ -26,14 +28,7 @@ class AdminView(QMainWindow):
         self.setWindowTitle("Physqgen Administration App")
 
         self.widgets = {}
-        
-        central = QWidget()
-        central.setLayout(QGridLayout())
-
-        self.setCentralWidget(central)
 
-        self.widgets["central"] = central
-        
         toolbar = QToolBar("toolbar")
         toolbar.setAllowedAreas(Qt.ToolBarArea.TopToolBarArea)
         toolbar.setMovable(False)
@@ -52,73 +47,59 @@ class AdminView(QMainWindow):
 
         toolbar.addAction(emptyDatabaseButton)
 
-        # toplevel layout is hbox.
-        # left container is for student names and emails
-        toplevelStudentInfoContainer = QFrame()
-        studentTopLevelLayout = QVBoxLayout()
-        toplevelStudentInfoContainer.setLayout(studentTopLevelLayout)
-        
-        central.layout().addWidget(QLabel("Student"), 0, 0, alignment=Qt.AlignmentFlag.AlignTop)
-        
-        # create the question columns on creation. will need a reload to update.
-        # determine via number of questions in active config
-        self._takeAtLocation = 0
-        for index, question in enumerate(config.questionConfigs):
-            # counter for where to start removing items
-            self._takeAtLocation += 1
-
-            # having these titles be correct relies on the questions being created in the same order
-            questionType = f"{question.questionType}:"
-            answerVariableName = question.answerVariableName
-            central = self.widgets["central"]
-
-            central.layout().addWidget(QLabel(questionType), 0, (2 * index) + 1, alignment=Qt.AlignmentFlag.AlignTop)
-            central.layout().addWidget(QLabel(answerVariableName), 0, (2 * index) + 2, alignment=Qt.AlignmentFlag.AlignTop)
-            # add number of tries and completed headers
-            central.layout().addWidget(QLabel("Submissions"), 1, (2 * index) + 1, alignment=Qt.AlignmentFlag.AlignTop)
-            central.layout().addWidget(QLabel("Completed"), 1, (2 * index) + 2, alignment=Qt.AlignmentFlag.AlignTop)
+        # the columns are made from the config on creation. will need a restart to update.
+        self.model = StudentTableModel(config)
+
+        # the view only draws the rows that are scrolled into view
+        table = QTableView()
+        table.setModel(self.model)
+        table.verticalHeader().hide()
+        # fixed row heights, so rows don't all have to be measured when many are added
+        table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+
+        self.setCentralWidget(table)
+
+        self.widgets["table"] = table
 
+        self.loader = StudentDataLoader(DATABASEPATH)
+        self.loader.loaded.connect(self.showChanges)
+        self.loader.failed.connect(self.statusBar().showMessage)
+
+        # created before the first load, so a change made during it is reloaded on the next tick
+        self.watcher = DataVersionWatcher(DATABASEPATH)
         self.reload()
 
         # auto-reload on a timer
         self.timer = QTimer()
-        # reload every half second
+        # check for changes every half second
         self.timer.setInterval(500)
-        self.timer.timeout.connect(self.reload)
+        self.timer.timeout.connect(self.reloadIfChanged)
         self.timer.start()
 
         return
 
     def reload(self) -> None:
-        """Reloads the visible data."""
-        # clear layouts
-        # 0 is student label, every group of four after is from a question in config. takeAt (0) + len(questions) * 4 + 1 (so am taking next one)
-        while (layoutItem := self.widgets["central"].layout().takeAt(self._takeAtLocation * 4 + 1)) != None:
-            layoutItem.widget().deleteLater()
-
-        # fetch all data
-        dynamicData = getStudentData()
-
-        for index, data in enumerate(dynamicData.items()):
-            name = data[0]
-            data = data[1]
-            gridLayout: QGridLayout = self.widgets["central"].layout()
-
-            gridLayout.addWidget(QLabel(name), index + 2, 0, alignment=Qt.AlignmentFlag.AlignLeft)
-
-            for columnIndex, questionData in enumerate(data):
-                # 0 is number of tries
-                # 1 is correct
-                gridLayout.addWidget(QLabel(str(questionData[0])), index + 2, columnIndex * 2 + 1, alignment=Qt.AlignmentFlag.AlignLeft)
-                gridLayout.addWidget(QLabel(str(questionData[1])), index + 2, columnIndex * 2 + 2, alignment=Qt.AlignmentFlag.AlignLeft)
-        
+        """Starts loading the data changed since the last load on a worker thread. The window is updated by showChanges when it finishes."""
+        self.loader.request()
+        return
+
+    def showChanges(self, changes: StudentDataChanges) -> None:
+        """Shows data loaded by the loader. Only the cells that changed are redrawn."""
+        # hides the message of a failed load
+        self.statusBar().clearMessage()
+        self.model.applyChanges(changes)
+        return
+
+    def reloadIfChanged(self) -> None:
+        """Reloads the visible data only if the database has changed since the last check, or the last load failed. Costs no table reads otherwise."""
+        # the failed load already used up the change the watcher reported, so it has to be retried without one
+        if self.watcher.changed() or self.loader.retry:
+            self.reload()
         return
     
     def clearDatabase(self) -> None:
-        """Deletes any existing database and generates a new blank one."""
-        # works, but only if some extra arbitrary closes are added in. They shouldn't be required because of the context managers, but they are.
-        remove(DATABASEPATH)
-        createDatabase(DATABASEPATH)
+        """Deletes all data stored in the database."""
+        clearDatabase(DATABASEPATH)
         # reload view to show changes
         self.reload()
         return
@@ -1,55 +1,93 @@
-from physqgen.admin import DATABASEPATH
-from physqgen.database import executeOnDatabase
+from dataclasses import dataclass
 
+from physqgen.admin.constants import DATABASEPATH
+from physqgen.database import executeOnDatabase, transaction
 
-def getStudentData() -> dict[str, list[tuple[int, bool]]]:
+
+@dataclass(slots=True)
+class StudentDataChanges:
     """
-    Collects wanted data from database.\n
-    Returns a dict with student names as keys (FirstName LastName (email) strings) and a list of the data associated with them from the database.\n
-    The nested tuple contains, in this order: numberTries, correct.
+    What getStudentDataSince found changed.\n
+    Attributes:\n
+        revision (int): the database's revision the data is from, to pass to the next call,\n
+        full (bool): whether students holds every student, replacing all earlier data, instead of only the changed ones,\n
+        students (dict[str, list[tuple[int, bool]]]): the data of the changed students, in the form getStudentData returns
     """
+    revision: int
+    full: bool
+    students: dict[str, list[tuple[int, bool]]]
 
-    sql = '''
-        SELECT
-            SESSION_UUID,
-            NUMBER_TRIES,
-            CORRECT
-        FROM
-            QUESTIONS
-    '''
-    results = executeOnDatabase(DATABASEPATH, sql)
 
+def groupByStudent(results: list) -> dict[str, list[tuple[int, bool]]]:
+    """Groups rows of first name, last name, email, numberTries and correct into the dict getStudentData returns."""
     studentQuestionInfo: dict = dict()
     for row in results:
-        sql = '''
-            SELECT
-                FIRST_NAME,
-                LAST_NAME,
-                EMAIL
-            FROM
-                SESSIONS
-            WHERE
-                SESSION_UUID=?
-        '''
-        replacements = (row[0],)
-        # should only get one result, index 0
-        sessionResults = executeOnDatabase(DATABASEPATH, sql, replacements)[0]
-        fullname = f"{sessionResults[0]} {sessionResults[1]} ({sessionResults[2]})"
+        fullname = f"{row[0]} {row[1]} ({row[2]})"
         # add the key for the student if it is not already there
         try:
             # if it is there, append to the list
-            studentQuestionInfo[fullname].append(
-                (
-                    row[1],
-                    row[2]
-                )
-            )
+            studentQuestionInfo[fullname].append((row[3], row[4]))
         except KeyError:
-            studentQuestionInfo[fullname] = [
-                (
-                    row[1],
-                    row[2]
-                )
-            ]
+            studentQuestionInfo[fullname] = [(row[3], row[4])]
 
     return studentQuestionInfo
+
+def getStudentData(databasePath: str = DATABASEPATH) -> dict[str, list[tuple[int, bool]]]:
+    """
+    Collects wanted data from database, with a single query.\n
+    Returns a dict with student names as keys (FirstName LastName (email) strings) and a list of the data associated with them from the database.\n
+    The nested tuple contains, in this order: numberTries, correct. Students are in the order they logged in, and their questions in the order they were given.
+    """
+    # the join leaves out questions generated ahead of time for a student who hasn't logged in yet
+    sql = '''
+        SELECT
+            SESSIONS.FIRST_NAME,
+            SESSIONS.LAST_NAME,
+            SESSIONS.EMAIL,
+            QUESTIONS.NUMBER_TRIES,
+            QUESTIONS.CORRECT
+        FROM QUESTIONS
+        JOIN SESSIONS ON SESSIONS.SESSION_UUID=QUESTIONS.SESSION_UUID
+        ORDER BY
+            SESSIONS.rowid,
+            QUESTIONS.rowid
+    '''
+    return groupByStudent(executeOnDatabase(databasePath, sql))
+
+def getStudentDataSince(databasePath: str = DATABASEPATH, revision: int | None = None) -> StudentDataChanges:
+    """
+    Collects the data of only the students who logged in, or whose questions changed, after revision (from the previous call's StudentDataChanges), so polling costs depend on activity instead of the amount of data stored.\n
+    Every student is collected instead if revision is None, or the database was cleared since it. Changed students' data is complete, and replaces what was collected for them before.
+    """
+    # one read transaction, so the rows are from exactly the revision that is returned
+    with transaction(databasePath):
+        currentRevision, clearedRevision = executeOnDatabase(databasePath, "SELECT REVISION, CLEARED_REVISION FROM REVISIONS")[0]
+        if revision is None or clearedRevision > revision:
+            return StudentDataChanges(currentRevision, True, getStudentData(databasePath))
+
+        # students are matched by name, like getStudentData, which merges all Sessions with the same name
+        sql = '''
+            SELECT
+                SESSIONS.FIRST_NAME,
+                SESSIONS.LAST_NAME,
+                SESSIONS.EMAIL,
+                QUESTIONS.NUMBER_TRIES,
+                QUESTIONS.CORRECT
+            FROM QUESTIONS
+            JOIN SESSIONS ON SESSIONS.SESSION_UUID=QUESTIONS.SESSION_UUID
+            WHERE (SESSIONS.FIRST_NAME, SESSIONS.LAST_NAME, SESSIONS.EMAIL) IN (
+                SELECT
+                    FIRST_NAME,
+                    LAST_NAME,
+                    EMAIL
+                FROM SESSIONS
+                WHERE
+                    REVISION>?1
+                    OR SESSION_UUID IN (SELECT SESSION_UUID FROM QUESTIONS WHERE REVISION>?1)
+            )
+            ORDER BY
+                SESSIONS.rowid,
+                QUESTIONS.rowid
+        '''
+        students = groupByStudent(executeOnDatabase(databasePath, sql, (revision,)))
+    return StudentDataChanges(currentRevision, False, students)
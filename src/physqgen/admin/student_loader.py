@@ -0,0 +1,91 @@
+from qtpy.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+from physqgen.admin.student_data import StudentDataChanges, getStudentDataSince
+
+
+class StudentDataLoader(QObject):
+    """
+    Runs getStudentDataSince on a worker thread and delivers each result to the GUI thread through the loaded signal, so slow reads never freeze the window.\n
+    At most one load runs at a time. Loads requested while one is running are coalesced into a single load, started after it finishes, so timer ticks never queue up duplicate queries.\n
+    Attributes:\n
+        Inherits attributes from QObject,\n
+        loaded (Signal): emitted with the StudentDataChanges since the previous load when a load finishes,\n
+        failed (Signal): emitted with the error message when a load raises,\n
+        databasePath (str): path to the database,\n
+        threadPool (QThreadPool): runs the loads,\n
+        revision (int | None): the revision of the last loaded data, None before the first load,\n
+        running (bool): whether a load is running,\n
+        pending (bool): whether another load was requested while one was running,\n
+        retry (bool): whether the last load failed, so the data shown may be out of date even if the database doesn't change again
+    """
+    loaded = Signal(object)
+    failed = Signal(str)
+
+    def __init__(self, databasePath: str) -> None:
+        super().__init__()
+        self.databasePath = databasePath
+        self.threadPool = QThreadPool.globalInstance()
+        self.revision = None
+        self.running = False
+        self.pending = False
+        self.retry = False
+        # emitted from the worker, so these are queued and run on the GUI thread, where this was created
+        self.loaded.connect(self.finishLoad)
+        self.failed.connect(self.finishFailed)
+        return
+
+    def request(self) -> None:
+        """Starts a load, or if one is running, makes sure another starts after it. Must be called from the GUI thread."""
+        if self.running:
+            # its result may be from before whatever caused this request
+            self.pending = True
+            return
+        self.running = True
+        self.threadPool.start(StudentDataLoad(self, self.revision))
+        return
+
+    def finishLoad(self, changes: StudentDataChanges) -> None:
+        """Runs on the GUI thread when a load succeeds, so the next one only fetches what changed after it."""
+        self.revision = changes.revision
+        self.retry = False
+        self.finish()
+        return
+
+    def finishFailed(self, _) -> None:
+        """Runs on the GUI thread when a load raises. Sets retry, so the owner requests another load, which fetches the changes since the last successful one."""
+        self.retry = True
+        self.finish()
+        return
+
+    def finish(self) -> None:
+        """Starts the coalesced load if one was requested while the finished one was running."""
+        self.running = False
+        if self.pending:
+            self.pending = False
+            self.request()
+        return
+
+
+class StudentDataLoad(QRunnable):
+    """
+    A single load started by a StudentDataLoader, run on its thread pool.\n
+    Attributes:\n
+        Inherits attributes from QRunnable,\n
+        loader (StudentDataLoader): the loader to deliver the result through,\n
+        revision (int | None): the revision to load the changes since
+    """
+    def __init__(self, loader: StudentDataLoader, revision: int | None) -> None:
+        super().__init__()
+        self.loader = loader
+        self.revision = revision
+        return
+
+    def run(self) -> None:
+        try:
+            changes = getStudentDataSince(self.loader.databasePath, self.revision)
+        except Exception as error:
+            # the window keeps showing the last data, and the loader's retry makes the next timer tick try again
+            self.loader.failed.emit(str(error))
+            return
+        self.loader.loaded.emit(changes)
+        return
@@ -0,0 +1,128 @@
+from qtpy.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+from physqgen.admin.student_data import StudentDataChanges
+from physqgen.generator import Config
+
+
+class StudentTableModel(QAbstractTableModel):
+    """
+    Table of every student's progress, for display in a QTableView. Column 0 is the student, then each question in the config has a submissions and a completed column.\n
+    New data is compared with the shown data, and views are only told about the cells that changed, so they don't redraw or rebuild anything else.\n
+    Attributes:\n
+        Inherits attributes from QAbstractTableModel,\n
+        headers (list[str]): the text of each column's header,\n
+        names (list[str]): the student in each row,\n
+        rowIndexes (dict[str, int]): the row of each student in names,\n
+        rows (list[list[tuple[int, bool]]]): each row's data from getStudentData
+    """
+    def __init__(self, config: Config) -> None:
+        super().__init__()
+        self.headers = ["Student"]
+        # having these titles be correct relies on the questions being created in the same order
+        for question in config.questionConfigs:
+            title = f"{question.questionType}: {question.answerVariableName}"
+            self.headers.append(f"{title}\nSubmissions")
+            self.headers.append(f"{title}\nCompleted")
+        self.names = []
+        self.rowIndexes = {}
+        self.rows = []
+        return
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        # a table has no children below its cells
+        if parent.isValid():
+            return 0
+        return len(self.rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self.headers)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        """Returns the text shown in the cell at index."""
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+
+        if index.column() == 0:
+            return self.names[index.row()]
+
+        questionIndex, field = divmod(index.column() - 1, 2)
+        questions = self.rows[index.row()]
+        if questionIndex >= len(questions):
+            # stored before the config gained questions
+            return None
+        # 0 is number of tries
+        # 1 is correct
+        return str(questions[questionIndex][field])
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole):
+        if orientation != Qt.Orientation.Horizontal or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        return self.headers[section]
+
+    def setStudentData(self, studentData: dict[str, list[tuple[int, bool]]]) -> None:
+        """Shows studentData (from getStudentData), telling views about the rows added and cells changed since the last call."""
+        names = list(studentData)
+        rows = list(studentData.values())
+
+        # students are only ever added at the end, unless the database was cleared
+        if names[:len(self.names)] != self.names:
+            self.beginResetModel()
+            self.names = names
+            self.rowIndexes = {name: rowIndex for rowIndex, name in enumerate(names)}
+            self.rows = rows
+            self.endResetModel()
+            return
+
+        for rowIndex, newRow in enumerate(rows[:len(self.rows)]):
+            self.updateRow(rowIndex, newRow)
+        self.appendRows(names[len(self.names):], rows[len(self.rows):])
+        return
+
+    def applyChanges(self, changes: StudentDataChanges) -> None:
+        """Shows the students changed in changes (from getStudentDataSince), keeping every other row as it is."""
+        if changes.full:
+            self.setStudentData(changes.students)
+            return
+
+        newNames = []
+        newRows = []
+        for name, newRow in changes.students.items():
+            try:
+                self.updateRow(self.rowIndexes[name], newRow)
+            except KeyError:
+                # logged in since the last changes, changes are in the order students logged in
+                newNames.append(name)
+                newRows.append(newRow)
+        self.appendRows(newNames, newRows)
+        return
+
+    def updateRow(self, rowIndex: int, newRow: list[tuple[int, bool]]) -> None:
+        """Replaces the data in the row at rowIndex, telling views about the cells that changed."""
+        oldRow = self.rows[rowIndex]
+        if oldRow == newRow:
+            return
+        self.rows[rowIndex] = newRow
+        changed = [
+            questionIndex for questionIndex in range(max(len(oldRow), len(newRow)))
+            if questionIndex >= len(oldRow) or questionIndex >= len(newRow) or oldRow[questionIndex] != newRow[questionIndex]
+        ]
+        # one signal per row, spanning its first to last changed question
+        firstColumn = changed[0] * 2 + 1
+        lastColumn = min(changed[-1] * 2 + 2, len(self.headers) - 1)
+        if firstColumn <= lastColumn:
+            self.dataChanged.emit(self.index(rowIndex, firstColumn), self.index(rowIndex, lastColumn))
+        return
+
+    def appendRows(self, names: list[str], rows: list[list[tuple[int, bool]]]) -> None:
+        """Adds rows for new students at the end of the table."""
+        if len(names) == 0:
+            return
+        self.beginInsertRows(QModelIndex(), len(self.names), len(self.names) + len(names) - 1)
+        for name in names:
+            self.rowIndexes[name] = len(self.names)
+            self.names.append(name)
+        self.rows.extend(rows)
+        self.endInsertRows()
+        return
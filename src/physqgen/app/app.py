@@ -1,5 +1,24 @@
+from os import environ, urandom
+
 from flask import Flask
 
+from physqgen.app.constants import (MIN_SECRET_KEY_LENGTH, SECRET_KEY_VARIABLE,
+                                    STATELESS_GRADING)
+
+
+def getSecretKey() -> str:
+    """
+    Returns the server's secret key, from the environment variable named by SECRET_KEY_VARIABLE, or a new random one if it isn't set.\n
+    Raises a RuntimeError if STATELESS_GRADING is on and the key from the environment is too short to keep the answers in session cookies private.
+    """
+    secretKey = environ.get(SECRET_KEY_VARIABLE)
+    if secretKey is None:
+        # only valid until the server restarts, cookies from before then are rejected and students log in again
+        return urandom(32).hex()
+
+    if STATELESS_GRADING and len(secretKey) < MIN_SECRET_KEY_LENGTH:
+        raise RuntimeError(f"STATELESS_GRADING needs a secret key of at least {MIN_SECRET_KEY_LENGTH} characters in {SECRET_KEY_VARIABLE}, so students can't decrypt the answers in their cookies. Unset it to use a random key instead.")
+    return secretKey
 
 #creating app
 def create_app():
@@ -7,14 +26,18 @@ def create_app():
     # create app
     app = Flask(__name__, template_folder="website")
     # secret key to be used for session cookies, security
-    app.config["SECRET_KEY"] ="Ajkjaksjksjaksjkiooooo"
+    app.config["SECRET_KEY"] = getSecretKey()
 
     # registering pages
     # must be imported in this function or will cause circular import error
     from physqgen.app.auth import auth
+    from physqgen.app.pool import questionSetPool
     from physqgen.app.view import views
 
     app.register_blueprint(views, url_prefix='/')
     app.register_blueprint(auth, url_prefix='/')
 
+    # start generating question sets before the first student logs in
+    questionSetPool.start()
+
     return app
@@ -1,11 +1,14 @@
 from os.path import join
 
-from flask import (Blueprint, redirect, render_template, request, session,
-                   url_for)
+from flask import (Blueprint, current_app, redirect, render_template,
+                   request, session, url_for)
 
-from physqgen.app import DATABASEPATH, IMG_FOLDER_PATH
-from physqgen.generator.config.session import appConfig
-from physqgen.session import LoginInfo, Session
+from physqgen.app import IMG_FOLDER_PATH
+from physqgen.app.cache import sessionCache
+from physqgen.app.constants import STATELESS_GRADING
+from physqgen.app.grading import gradingData
+from physqgen.app.pool import questionSetPool
+from physqgen.session import LoginInfo
 
 #defining views for routes
 auth = Blueprint('auth', __name__)
@@ -18,24 +21,24 @@ def log_in() -> str:
     """
     #getting input from the form, passing it into the session class
     if request.method == "POST":
-        sess = Session(
-            DATABASEPATH,
+        # claim a question set that was generated, given an active question, and stored ahead of time
+        # storing the student's LoginInfo is queued, not waited for
+        sess, write = questionSetPool.claim(
             LoginInfo(
                 # user input
                 request.form["name"],
                 request.form["last-name"],
                 request.form["email-address"]
-            ),
-            questions=appConfig.generateQuestions()
+            )
         )
-        # set an active question
-        sess.setNewActiveQuestion()
-
-        # add new session to the database
-        sess.addToDatabase()
+        # keep it in memory for the first submission
+        sessionCache.add(sess, write)
 
         # https://dev.to/sachingeek/session-in-flask-store-user-specific-data-on-server-28ap
         session["user"] = sess.frontendData
+        if STATELESS_GRADING:
+            # lets incorrect submissions be graded without loading the Session, see grading.py
+            session["user"]["grading"] = gradingData(sess.activeQuestion, current_app.secret_key)
         # add image path for initial display before any submissions
         session["user"]["activeQuestion"]["imagePath"] = join(IMG_FOLDER_PATH, session["user"]["activeQuestion"]["imageFilename"])
 
@@ -0,0 +1,190 @@
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from threading import Lock
+from time import monotonic
+from typing import Iterator
+
+from physqgen.app.constants import (CLEARED_CHECK_INTERVAL, DATABASEPATH,
+                                    SESSION_CACHE_SIZE)
+from physqgen.database import executeOnDatabase, getDatabaseWriter
+from physqgen.session import Session
+
+
+@dataclass(slots=True)
+class CacheEntry:
+    """
+    A cached Session and the lock that stops two requests from updating it at the same time.\n
+    Attributes:\n
+        session (Session | None): the live Session, None until it is loaded,\n
+        lock (Lock): held while the Session is being loaded or used,\n
+        users (int): how many requests are using or waiting to use the entry, guarded by the SessionCache's lock. Entries with users are never evicted
+    """
+    session: Session | None = None
+    lock: Lock = field(default_factory=Lock)
+    users: int = 0
+
+
+class SessionCache:
+    """
+    In-memory store of live Session objects keyed by session uuid, so graded submissions don't need to rebuild the Session from the database.\n
+    Sessions queue their own changes to be written to the database when updated, so an entry can be dropped at any time without losing data.
+    Once maxSize Sessions are stored, the least recently used one that isn't in use is evicted. Every Session is dropped when the admin clears session data.\n
+    Attributes:\n
+        databasePath (str): path to the database Sessions are loaded from,\n
+        maxSize (int): maximum number of Sessions kept in memory, exceeded only while more than that many are in use,\n
+        clearedCheckInterval (float): the fewest seconds between checks for the admin clearing session data, see clearIfDatabaseCleared,\n
+        entries (OrderedDict[str, CacheEntry]): cached entries, least recently used first,\n
+        clearedRevision (int | None): the CLEARED_REVISION in REVISIONS when it was last checked, None before the first check,\n
+        nextClearedCheck (float): the time.monotonic time after which clearIfDatabaseCleared checks again,\n
+        failed (set[str]): uuids of Sessions that had a queued write fail, which have to be loaded the next time they are used, see loadRequired,\n
+        lock (Lock): guards entries, the users of every entry, clearedRevision, nextClearedCheck and failed
+    """
+    def __init__(self, databasePath: str, maxSize: int, clearedCheckInterval: float) -> None:
+        self.databasePath = databasePath
+        self.maxSize = maxSize
+        self.clearedCheckInterval = clearedCheckInterval
+        self.entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self.clearedRevision = None
+        self.nextClearedCheck = 0.0
+        self.failed: set[str] = set()
+        self.lock = Lock()
+        return
+
+    def getEntry(self, sessionUUID: str, pin: bool = False) -> CacheEntry:
+        """
+        Returns the entry for sessionUUID, marking it most recently used, or creates an empty one, evicting the least recently used entries not in use if over maxSize.\n
+        If pin is True, the entry is counted as in use, so it can't be evicted, until the caller calls unpin.
+        """
+        with self.lock:
+            entry = self.entries.get(sessionUUID)
+            if entry is None:
+                entry = self.entries[sessionUUID] = CacheEntry()
+            else:
+                self.entries.move_to_end(sessionUUID)
+            if pin:
+                entry.users += 1
+
+            excess = len(self.entries) - self.maxSize
+            if excess > 0:
+                # an entry in use has to stay, or another request for the same Session would load a second live copy of it
+                unused = []
+                for uuid, cached in self.entries.items():
+                    if len(unused) == excess:
+                        break
+                    if cached.users == 0:
+                        unused.append(uuid)
+                for uuid in unused:
+                    del self.entries[uuid]
+            return entry
+
+    def unpin(self, entry: CacheEntry) -> None:
+        """Counts one less use of an entry pinned by getEntry."""
+        with self.lock:
+            entry.users -= 1
+        return
+
+    def add(self, sess: Session, write: Future) -> None:
+        """Stores a Session whose write to the database has just been queued as write, so its first submission doesn't need to load it."""
+        self.getEntry(str(sess.uuid)).session = sess
+        self.watch(str(sess.uuid), write)
+        return
+
+    def watch(self, sessionUUID: str, write: Future | None) -> None:
+        """
+        Drops the cached Session for sessionUUID if write, a queued write of it, fails. It is then reloaded from what is actually stored next time it is used, which raises an IndexError if it was cleared.\n
+        Submissions graded without using the Session check loadRequired, so they are sent to load it too. Does nothing if write is None.
+        """
+        if write is None:
+            return
+
+        def invalidateIfFailed(future: Future) -> None:
+            if future.exception() is not None:
+                with self.lock:
+                    self.failed.add(sessionUUID)
+                self.invalidate(sessionUUID)
+            return
+
+        write.add_done_callback(invalidateIfFailed)
+        return
+
+    @contextmanager
+    def use(self, sessionUUID: str) -> Iterator[Session]:
+        """
+        Yields the live Session for sessionUUID, loading it from the database if it isn't cached. No other request can use the same Session until the block exits.\n
+        Raises an IndexError if session data has been cleared since the Session was created. Cached Sessions are dropped first if it has been, see clearIfDatabaseCleared.
+        A clear made less than clearedCheckInterval ago may not be noticed yet, in which case the write of the stale Session fails, and it is reloaded on its next use.
+        Writes of the Session made in the block should be passed to watch, so that if they fail, it is reloaded instead of being used again.
+        """
+        self.clearIfDatabaseCleared()
+        with self.lock:
+            # the failed write already dropped the Session, so it is loaded below
+            self.failed.discard(sessionUUID)
+        entry = self.getEntry(sessionUUID, pin=True)
+        try:
+            with entry.lock:
+                # read once, invalidate may set it to None at any time
+                sess = entry.session
+                try:
+                    if sess is None:
+                        # the last writes of this Session, from before it was evicted, may still be queued
+                        getDatabaseWriter(self.databasePath).flush()
+                        sess = entry.session = Session.fromDatabase(self.databasePath, sessionUUID)
+                    yield sess
+                except IndexError:
+                    self.invalidate(sessionUUID)
+                    raise
+        finally:
+            self.unpin(entry)
+        return
+
+    def loadRequired(self, sessionUUID: str) -> bool:
+        """Returns whether a queued write for sessionUUID has failed since it was last used, so what is stored for it has to be loaded before the next submission is graded."""
+        with self.lock:
+            return sessionUUID in self.failed
+
+    def invalidate(self, sessionUUID: str) -> None:
+        """Drops the cached Session for sessionUUID, if there is one. It will be reloaded from the database the next time it is used."""
+        with self.lock:
+            entry = self.entries.get(sessionUUID)
+            if entry is None:
+                return
+            # an entry in use is kept, so the requests waiting on its lock reload into it instead of making a second live Session
+            if entry.users == 0:
+                del self.entries[sessionUUID]
+            entry.session = None
+        return
+
+    def clearIfDatabaseCleared(self) -> None:
+        """
+        Drops every cached Session if session data has been cleared, by clearDatabase, since this last checked. They are then reloaded when used, which raises an IndexError for the cleared ones.\n
+        Checked with one read of the single row in REVISIONS, at most once every clearedCheckInterval seconds, so submissions normally don't read the database at all.
+        The first check always drops them, since a clear before it can't be ruled out.
+        """
+        now = monotonic()
+        with self.lock:
+            if now < self.nextClearedCheck:
+                return
+            self.nextClearedCheck = now + self.clearedCheckInterval
+
+        clearedRevision = executeOnDatabase(self.databasePath, "SELECT CLEARED_REVISION FROM REVISIONS")[0][0]
+        with self.lock:
+            if clearedRevision == self.clearedRevision:
+                return
+            self.clearedRevision = clearedRevision
+        self.clear()
+        return
+
+    def clear(self) -> None:
+        """Drops every cached Session. Entries in use are kept, empty, see invalidate."""
+        with self.lock:
+            for sessionUUID, entry in list(self.entries.items()):
+                if entry.users == 0:
+                    del self.entries[sessionUUID]
+                entry.session = None
+        return
+
+
+# shared by every request the server handles
+sessionCache = SessionCache(DATABASEPATH, SESSION_CACHE_SIZE, CLEARED_CHECK_INTERVAL)
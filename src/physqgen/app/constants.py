@@ -6,3 +6,25 @@ DATABASEPATH = join(".", "data", "data.db")
 
 # relative to view.py
 IMG_FOLDER_PATH = join('.', 'static', 'images')
+
+# how many question sets are kept generated and stored ahead of time, so that many students can log in at once without waiting
+QUESTION_SET_POOL_SIZE = 40
+
+# the most live Sessions the server keeps in memory, enough for several full classes at once
+SESSION_CACHE_SIZE = 512
+
+# the fewest seconds between checks, by the Session cache, for the admin clearing session data
+# submissions in between don't read the database, a clear is noticed by the first one after this long
+CLEARED_CHECK_INTERVAL = 1.0
+
+# if True, incorrect submissions are graded from the session cookie, which also holds the encrypted answer to the active question, without reading the database
+# the answer is only as private as the server's secret key, see SECRET_KEY_VARIABLE
+# the Session is only loaded once the question is answered correctly, to move on to the next one. see grading.py
+STATELESS_GRADING = False
+
+# the environment variable the server's secret key is read from. the key signs the session cookie, and encrypts the answers in it for stateless grading, so it must be kept private and never committed
+# if it isn't set, a random key is made each time the server starts, which logs every student out when the server restarts
+SECRET_KEY_VARIABLE = "PHYSQGEN_SECRET_KEY"
+
+# the shortest secret key the server starts with while STATELESS_GRADING is on, a short key could be guessed to decrypt the answers
+MIN_SECRET_KEY_LENGTH = 32
@@ -0,0 +1,40 @@
+from hashlib import sha256
+from hmac import digest
+from struct import pack, unpack
+
+from physqgen.generator.question import Question
+
+# the session cookie is signed, so it can't be changed, but anyone can read it
+# answers in it are encrypted by XOR with a keystream that is unique to each question, made from the server's secret key
+# anyone who knows the secret key can decrypt their own answer, so it must be private, never the one in a public repository. see SECRET_KEY_VARIABLE in constants.py
+
+
+def answerKeystream(secretKey: str, questionUUID: str) -> bytes:
+    """Returns the 8 bytes that the answer to the question with questionUUID is XORed with. Different for every question, and can't be found without secretKey."""
+    return digest(secretKey.encode(), f"answer {questionUUID}".encode(), sha256)[:8]
+
+def encryptAnswer(secretKey: str, questionUUID: str, answer: float) -> str:
+    """Returns answer encrypted for storing in the session cookie, as hex text. See decryptAnswer."""
+    keystream = answerKeystream(secretKey, questionUUID)
+    return bytes(a ^ b for a, b in zip(pack(">d", answer), keystream)).hex()
+
+def decryptAnswer(secretKey: str, questionUUID: str, encryptedAnswer: str) -> float:
+    """Returns the answer encrypted by encryptAnswer for the same secretKey and questionUUID."""
+    keystream = answerKeystream(secretKey, questionUUID)
+    return unpack(">d", bytes(a ^ b for a, b in zip(bytes.fromhex(encryptedAnswer), keystream)))[0]
+
+def gradingData(question: Question | None, secretKey: str) -> dict | None:
+    """Returns what is needed to grade submissions to question without loading it, for storing in the session cookie, or None if question is None (all questions are complete)."""
+    if question is None:
+        return None
+
+    return {
+        "questionUUID": str(question.uuid),
+        "answer": encryptAnswer(secretKey, str(question.uuid), question.answer),
+        "correctLeeway": question.correctLeeway
+    }
+
+def gradeFromCookie(grading: dict, secretKey: str, submission: float) -> bool:
+    """Returns whether submission is correct for the question grading (from gradingData) was made for, without any database reads."""
+    answer = decryptAnswer(secretKey, grading["questionUUID"], grading["answer"])
+    return Question.withinLeeway(answer, grading["correctLeeway"], submission)
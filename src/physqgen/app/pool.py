@@ -0,0 +1,123 @@
+from collections import deque
+from concurrent.futures import Future
+from threading import Condition, Thread
+from time import sleep
+from traceback import print_exc
+
+from physqgen.app.constants import DATABASEPATH, QUESTION_SET_POOL_SIZE
+from physqgen.database import (deleteUnclaimedQuestions, executeOnDatabase,
+                               getDatabaseWriter, transaction, uuidBlob)
+from physqgen.generator import Config
+from physqgen.generator.config.session import appConfig
+from physqgen.generator.question import Question
+from physqgen.session import LoginInfo, Session
+
+# how many question sets are stored per write when refilling, so other writes never wait long behind the refill
+REFILL_BATCH_SIZE = 10
+
+
+class QuestionSetPool:
+    """
+    Keeps a number of question sets generated, with an active question set, and stored in the database ahead of time, so logging in only needs to claim one and store the student's LoginInfo.\n
+    A background thread refills the pool whenever sets are claimed.
+    Questions in the pool have no row in SESSIONS until they are claimed, so they aren't shown in the admin app, and are deleted when the server next starts if never claimed.\n
+    Attributes:\n
+        databasePath (str): path to the database,\n
+        config (Config): configuration to generate questions from,\n
+        size (int): number of sets to keep ready,\n
+        sets (deque[Session]): ready Sessions, with blank LoginInfo, whose Questions are already stored,\n
+        condition (Condition): guards sets, and wakes the refill thread when a set is claimed,\n
+        thread (Thread | None): the refill thread, None until started
+    """
+    def __init__(self, databasePath: str, config: Config, size: int) -> None:
+        self.databasePath = databasePath
+        self.config = config
+        self.size = size
+        self.sets: deque[Session] = deque()
+        self.condition = Condition()
+        self.thread = None
+        return
+
+    def start(self) -> None:
+        """Deletes sets left over from a previous run and starts the refill thread, if it isn't already running."""
+        if self.thread is not None:
+            return
+        deleteUnclaimedQuestions(self.databasePath)
+        # daemon so it doesn't keep the server running when it is closed
+        self.thread = Thread(target=self.refill, name="QuestionSetPool", daemon=True)
+        self.thread.start()
+        return
+
+    def refill(self) -> None:
+        """Runs on the refill thread. Waits until the pool is short of sets, then generates and stores them in batches, each as one write on the DatabaseWriter."""
+        while True:
+            with self.condition:
+                while len(self.sets) >= self.size:
+                    self.condition.wait()
+                missing = min(self.size - len(self.sets), REFILL_BATCH_SIZE)
+
+            try:
+                sessions = [
+                    Session(self.databasePath, LoginInfo("", "", ""), questions=questions)
+                    for questions in self.config.generateBatch(missing)
+                ]
+                for sess in sessions:
+                    sess.setNewActiveQuestion()
+                # waiting is fine here, the sets can't be claimed until they are stored
+                getDatabaseWriter(self.databasePath).submit(lambda: self.writeSets(sessions)).result()
+            except Exception:
+                # most likely the database was locked for too long, try again shortly
+                # logins still work while the pool is empty, just slower
+                print_exc()
+                sleep(1)
+                continue
+
+            with self.condition:
+                self.sets.extend(sessions)
+
+    def writeSets(self, sessions: list[Session]) -> None:
+        """Stores the Questions of every one of sessions, without their LoginInfo. Runs on the writer thread."""
+        for sess in sessions:
+            Question.addManyToDatabase(self.databasePath, sess.uuid, sess.questions)
+        return
+
+    def questionsStored(self, sess: Session) -> bool:
+        """Returns whether the Questions of sess, a Session from the pool, are still stored. They are gone if the database was cleared since they were added."""
+        sql = '''SELECT 1 FROM QUESTIONS WHERE SESSION_UUID=? LIMIT 1'''
+        return len(executeOnDatabase(self.databasePath, sql, (uuidBlob(sess.uuid),))) > 0
+
+    def writeClaim(self, sess: Session) -> None:
+        """Stores the LoginInfo of sess, a claimed Session from the pool. Raises an IndexError, storing nothing, if its Questions were cleared after it was claimed. Runs on the writer thread."""
+        with transaction(self.databasePath):
+            if not self.questionsStored(sess):
+                raise IndexError("Session has been cleared. Cannot add data.")
+            sess.addLoginInfoToDatabase()
+        return
+
+    def claim(self, loginInfo: LoginInfo) -> tuple[Session, Future]:
+        """
+        Returns a new Session for loginInfo that has an active question set, and the Future of the queued write that stores it in the database.\n
+        Uses a set from the pool if there is one, otherwise generates a new one immediately, as if there was no pool.
+        """
+        with self.condition:
+            sess = self.sets.popleft() if len(self.sets) > 0 else None
+            self.condition.notify()
+
+        if sess is not None:
+            if self.questionsStored(sess):
+                sess.loginInfo = loginInfo
+                # checked again when written, in case the database is cleared while the write is queued
+                return sess, getDatabaseWriter(self.databasePath).submit(lambda: self.writeClaim(sess))
+
+            # every other set in the pool was cleared too
+            with self.condition:
+                self.sets.clear()
+                self.condition.notify()
+
+        sess = Session(self.databasePath, loginInfo, questions=self.config.generateQuestions())
+        sess.setNewActiveQuestion()
+        return sess, sess.addToDatabase()
+
+
+# shared by every request the server handles, started by create_app
+questionSetPool = QuestionSetPool(DATABASEPATH, appConfig, QUESTION_SET_POOL_SIZE)
@@ -1,10 +1,13 @@
 from os.path import join
 
-from flask import (Blueprint, Response, redirect, render_template, request,
-                   session, url_for)
+from flask import (Blueprint, Response, current_app, flash, redirect,
+                   render_template, request, session, url_for)
 
 from physqgen.app import DATABASEPATH, IMG_FOLDER_PATH
-from physqgen.session import Session
+from physqgen.app.cache import sessionCache
+from physqgen.app.constants import STATELESS_GRADING
+from physqgen.app.grading import gradeFromCookie, gradingData
+from physqgen.generator.question import Question
 
 views = Blueprint('views', __name__)
 
@@ -42,21 +45,41 @@ def qpage() -> str | Response:
             # don't count as a submission if the input is not a float value
             invalidAnswer = True
 
-        if not invalidAnswer:
+        grading = session["user"].get("grading")
+        sessionUUID = session["user"]["sessionUUID"]
+        # if an earlier write for this student failed, the Session is loaded instead, which sends them to login if the database was cleared
+        if not invalidAnswer and STATELESS_GRADING and grading is not None and not sessionCache.loadRequired(sessionUUID) and not gradeFromCookie(grading, current_app.secret_key, submission):
+            # incorrect, so only the number of tries changes and an Attempt is stored, and the Session doesn't need to be loaded
+            sessionCache.watch(sessionUUID, Question.recordAttempt(DATABASEPATH, grading["questionUUID"], submission))
+            # the cached Session's numberTries is out of date now, it is loaded again once the question is answered correctly
+            sessionCache.invalidate(sessionUUID)
+            session["user"]["activeQuestion"]["numberTries"] += 1
+            # changes inside session["user"] aren't detected automatically
+            session.modified = True
+        elif not invalidAnswer:
             try:
-                sess = Session.fromDatabase(DATABASEPATH, session["user"]["sessionUUID"])
+                # the live Session is kept in memory between submissions, only loaded from the database the first time or after eviction
+                with sessionCache.use(sessionUUID) as sess:
+                    # checks whether the submission is correct, and if so activates a new question if there is any that are not complete
+                    # if is not time to go to exit page
+                    if session["user"]["activeQuestion"] is not None:
+                        # the database write is queued, if it fails the Session is reloaded on the next submission
+                        sessionCache.watch(sessionUUID, sess.update(submission))
+
+                    # update data visible on frontend after updating sess
+                    session["user"] = sess.frontendData
+                    if STATELESS_GRADING:
+                        session["user"]["grading"] = gradingData(sess.activeQuestion, current_app.secret_key)
             except IndexError:
                 # will error this way if the database has been cleared since session creation
                 # redirect to login
+                flash("Your saved progress was cleared. Please log in again.")
+                return redirect(url_for("auth.log_in"), code=302)
+            except ValueError:
+                # loading a question stored in compact form errors this way if the config it was generated from has been changed since session creation
+                # it can't be rebuilt, so start again from login with questions from the new config
+                flash("The questions were changed since you logged in. Please log in again.")
                 return redirect(url_for("auth.log_in"), code=302)
-
-            # checks whether the submission is correct, and if so activates a new question if there is any that are not complete
-            # if is not time to go to exit page
-            if session["user"]["activeQuestion"] is not None:
-                sess.update(submission)
-            
-            # update data visible on frontend after updating sess
-            session["user"] = sess.frontendData
 
             # if is not time to go to exit page
             if session["user"]["activeQuestion"] is not None:
@@ -67,7 +90,7 @@ def qpage() -> str | Response:
     # all questions complete, applies to both GET and POST
     # this will continue to redirect the user even if the database is cleared because the cookie is still present
     # could be changed to reconstruct the session object, fail, and send to login, if that is preferred
-    # ideally that would be by moving the above .fromDatabase call out of the POST section
+    # ideally that would be by moving the above sessionCache.use call out of the POST section
     if session["user"]["sessionComplete"]:
         return redirect(url_for("views.exit"), code=302)
     
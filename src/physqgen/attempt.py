@@ -0,0 +1,92 @@
+from dataclasses import dataclass, field
+from time import time
+from uuid import UUID
+
+from physqgen.database import (executeManyOnDatabase, executeOnDatabase,
+                               uuidBlob)
+
+
+@dataclass(slots=True)
+class Attempt:
+    """
+    A single submission to a Question, stored in the ATTEMPTS table. Attempts are only ever added, never changed.\n
+    Attributes:\n
+        questionUUID (UUID): uuid of the Question the submission was for,\n
+        value (float): the submitted value,\n
+        correct (bool): whether the submission was graded as correct,\n
+        submittedAt (float): when the submission was graded, in seconds since the epoch
+    """
+    questionUUID: UUID
+    value: float
+    correct: bool
+    submittedAt: float = field(default_factory=time)
+
+    def databaseRow(self) -> tuple:
+        """Returns this Attempt's data as a row of replacements for the insert in addManyToDatabase."""
+        return (
+            uuidBlob(self.questionUUID),
+            self.value,
+            self.correct,
+            self.submittedAt
+        )
+
+    @staticmethod
+    def addManyToDatabase(databasePath: str, attempts: list) -> None:
+        """Adds all passed Attempts (list[Attempt]) to the database with a single executemany."""
+        sql = '''
+            INSERT INTO ATTEMPTS (
+                QUESTION_UUID,
+                VALUE,
+                CORRECT,
+                SUBMITTED_AT
+            ) VALUES (
+                ?,
+                ?,
+                ?,
+                ?
+            )
+        '''
+        executeManyOnDatabase(databasePath, sql, [attempt.databaseRow() for attempt in attempts])
+        return
+
+    @staticmethod
+    def manyFromDatabase(databasePath: str, questionUUID: str | UUID) -> list:
+        """Returns every stored Attempt (list[Attempt]) at the Question with questionUUID, in the order they were submitted."""
+        sql = '''
+            SELECT
+                VALUE,
+                CORRECT,
+                SUBMITTED_AT
+            FROM ATTEMPTS
+            WHERE QUESTION_UUID=?
+            ORDER BY rowid
+        '''
+        results = executeOnDatabase(databasePath, sql, (uuidBlob(questionUUID),))
+        return [
+            Attempt(
+                questionUUID=UUID(str(questionUUID)),
+                value=row[0],
+                correct=bool(row[1]),
+                submittedAt=row[2]
+            )
+            for row in results
+        ]
+
+    @staticmethod
+    def countsByQuestionText(databasePath: str) -> dict[str, tuple[int, int, int]]:
+        """
+        Returns statistics for each configured question that has any Attempts, keyed by its text. Counted by the database in one query.\n
+        The tuple contains, in this order: the number of Attempts, how many of them were correct, and how many students made them.
+        """
+        sql = '''
+            SELECT
+                QUESTION_TEMPLATES.TEXT,
+                COUNT(*),
+                TOTAL(ATTEMPTS.CORRECT),
+                COUNT(DISTINCT QUESTIONS.SESSION_UUID)
+            FROM ATTEMPTS
+            JOIN QUESTIONS ON QUESTIONS.QUESTION_UUID=ATTEMPTS.QUESTION_UUID
+            JOIN QUESTION_TEMPLATES ON QUESTION_TEMPLATES.TEMPLATE_ID=QUESTIONS.TEMPLATE_ID
+            GROUP BY QUESTION_TEMPLATES.TEXT
+        '''
+        return {row[0]: (row[1], int(row[2]), row[3]) for row in executeOnDatabase(databasePath, sql)}
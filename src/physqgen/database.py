@@ -1,17 +1,357 @@
-from sqlite3 import connect
-from typing import Iterator
+from atexit import register
+from concurrent.futures import Future
+from contextlib import contextmanager
+from os.path import abspath
+from queue import Empty, LifoQueue, SimpleQueue
+from sqlite3 import Connection, connect
+from threading import Lock, Thread, local
+from traceback import print_exc
+from typing import Any, Callable, Iterator
+from uuid import UUID
 
+# applied once to every connection when it is opened
+# WAL lets the admin app read while the server writes, and synchronous=NORMAL is safe in WAL mode while skipping most fsyncs
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    # milliseconds to wait for another connection's lock before raising "database is locked"
+    "PRAGMA busy_timeout=5000",
+    # negative values are in KiB, so this is 8 MiB of page cache per connection
+    "PRAGMA cache_size=-8000"
+)
+
+
+class PerDatabase:
+    """
+    Holds one object per database file, created on first use and shared by all threads. Different paths to the same file share the same object.\n
+    Attributes:\n
+        factory (Callable[[str], Any]): creates the object for a database path,\n
+        objects (dict[str, Any]): created objects, keyed by absolute path of their database,\n
+        lock (Lock): guards objects
+    """
+    def __init__(self, factory: Callable[[str], Any]) -> None:
+        self.factory = factory
+        self.objects: dict[str, Any] = {}
+        self.lock = Lock()
+        return
+
+    def get(self, databasePath: str) -> Any:
+        """Returns the object for the database at databasePath, creating it on first use."""
+        key = abspath(databasePath)
+        with self.lock:
+            try:
+                return self.objects[key]
+            except KeyError:
+                created = self.objects[key] = self.factory(databasePath)
+                return created
+
+    def remove(self, databasePath: str) -> Any:
+        """Forgets the object for the database at databasePath and returns it, or None if there wasn't one. A new one is created if it is used again."""
+        with self.lock:
+            return self.objects.pop(abspath(databasePath), None)
+
+    def all(self) -> list:
+        """Returns every object created so far."""
+        with self.lock:
+            return list(self.objects.values())
+
+
+class ConnectionPool:
+    """
+    Keeps open sqlite3 connections to a single database for reuse for the lifetime of the process, instead of connecting for every statement.\n
+    A connection is checked out by a thread for the duration of a connection() or transaction() block, so nested blocks on the same thread share it.\n
+    Attributes:\n
+        databasePath (str): path to the database,\n
+        maxIdle (int): the maximum number of unused connections to keep open,\n
+        idle (LifoQueue): connections that are not currently checked out,\n
+        threadState (local): the connection checked out by the current thread and how many blocks are using it
+    """
+    def __init__(self, databasePath: str, maxIdle: int = 8) -> None:
+        self.databasePath = databasePath
+        self.maxIdle = maxIdle
+        self.idle = LifoQueue()
+        self.threadState = local()
+        return
+
+    def openConnection(self) -> Connection:
+        """Opens a new connection to the database with CONNECTION_PRAGMAS applied."""
+        # isolation_level None means statements outside of transaction() are committed immediately
+        # check_same_thread is disabled because idle connections are handed to whichever thread needs one next
+        connection = connect(self.databasePath, isolation_level=None, check_same_thread=False)
+        for pragma in CONNECTION_PRAGMAS:
+            connection.execute(pragma)
+        return connection
+
+    @contextmanager
+    def connection(self) -> Iterator[Connection]:
+        """Checks out a connection for the current thread, reusing the one it already has checked out if this block is nested."""
+        state = self.threadState
+        if getattr(state, "depth", 0) > 0:
+            state.depth += 1
+            try:
+                yield state.connection
+            finally:
+                state.depth -= 1
+            return
+
+        try:
+            connection = self.idle.get_nowait()
+        except Empty:
+            connection = self.openConnection()
+
+        state.connection = connection
+        state.depth = 1
+        try:
+            yield connection
+        finally:
+            state.depth = 0
+            state.connection = None
+            # never hand a connection with a half finished transaction to another thread
+            if connection.in_transaction:
+                connection.rollback()
+            if self.idle.qsize() < self.maxIdle:
+                self.idle.put(connection)
+            else:
+                connection.close()
+
+    @contextmanager
+    def transaction(self, immediate: bool = False) -> Iterator[Connection]:
+        """
+        Runs the contained statements as one unit, committing when the block exits and rolling back if it raises.\n
+        If immediate is True, the write lock is taken at the start instead of at the first write, so no other connection can write between reading and writing.\n
+        A transaction opened inside another one on the same thread joins the outer one.
+        """
+        with self.connection() as connection:
+            if connection.in_transaction:
+                yield connection
+                return
+
+            connection.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+            try:
+                yield connection
+            except BaseException:
+                connection.rollback()
+                raise
+            connection.commit()
+
+    def close(self) -> None:
+        """Closes all idle connections. Connections that are checked out will be reopened as needed."""
+        while True:
+            try:
+                self.idle.get_nowait().close()
+            except Empty:
+                return
+
+
+connectionPools = PerDatabase(ConnectionPool)
+
+def getConnectionPool(databasePath: str) -> ConnectionPool:
+    """Returns the ConnectionPool for the database at databasePath, creating it on first use."""
+    return connectionPools.get(databasePath)
+
+def transaction(databasePath: str, immediate: bool = False):
+    """Context manager running every executeOnDatabase call made on this thread inside it as one transaction. See ConnectionPool.transaction."""
+    return getConnectionPool(databasePath).transaction(immediate)
+
+def closeConnections() -> None:
+    """Closes all idle pooled connections, for every database."""
+    for pool in connectionPools.all():
+        pool.close()
+    return
+
+# submitted by DatabaseWriter.flush in place of a write
+FLUSH = object()
+
+
+class DatabaseWriter:
+    """
+    Runs the writes to a single database, one after another in the order they were submitted, on its own background thread.\n
+    Request threads hand their writes to it instead of committing themselves, so they never contend for the database lock or wait for a commit to reach the disk.
+    Every write waiting when a transaction starts is run in it, so a burst of writes is committed together (a group commit). Each write runs in its own savepoint, so one that raises doesn't undo the others.\n
+    Attributes:\n
+        databasePath (str): path to the database,\n
+        maxBatch (int): the most writes committed in one transaction,\n
+        queue (SimpleQueue): submitted writes, and the Futures to report their results to, that haven't been run yet,\n
+        thread (Thread | None): the writer thread, started by the first submitted write,\n
+        lock (Lock): guards starting thread
+    """
+    def __init__(self, databasePath: str, maxBatch: int = 256) -> None:
+        self.databasePath = databasePath
+        self.maxBatch = maxBatch
+        self.queue = SimpleQueue()
+        self.thread = None
+        self.lock = Lock()
+        return
+
+    def submit(self, write: Callable[[], Any]) -> Future:
+        """
+        Queues write, a function that writes using executeOnDatabase or the other helpers in this module, to be run on the writer thread.\n
+        Returns a Future that gets the value write returns, or the exception it raises, once its transaction has been committed (or has failed). Callers that need to know the write is stored wait on it, others can ignore it.
+        """
+        future = Future()
+        with self.lock:
+            if self.thread is None:
+                # daemon so it doesn't keep the program running when it is closed, flushDatabaseWriters runs what is still queued at exit
+                self.thread = Thread(target=self.run, name="DatabaseWriter", daemon=True)
+                self.thread.start()
+        self.queue.put((write, future))
+        return future
+
+    def flush(self) -> None:
+        """Waits until every write submitted before this call has been committed or has failed. Doesn't open a transaction of its own."""
+        self.submit(FLUSH).result()
+        return
+
+    def run(self) -> None:
+        """Runs on the writer thread. Waits for writes, then runs every waiting write (up to maxBatch) in one transaction with runBatch. Never stops, since flush and every Future would wait forever if it did."""
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < self.maxBatch:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except Empty:
+                    break
+
+            try:
+                self.runBatch(batch)
+            except BaseException as error:
+                # only reached through a bug in runBatch, report it instead of stopping the thread
+                print_exc()
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(error)
+
+    def runBatch(self, batch: list[tuple[Callable[[], Any], Future]]) -> None:
+        """Runs the writes in batch in one transaction, and reports their results after it commits. Flushes are reported last, and don't need a transaction if there is nothing else to write."""
+        # Futures cancelled while queued are skipped, the others can't be cancelled from now on, so reporting their results can't fail
+        batch = [(write, future) for write, future in batch if future.set_running_or_notify_cancel()]
+        writes = [(write, future) for write, future in batch if write is not FLUSH]
+
+        results = []
+        if len(writes) > 0:
+            try:
+                # immediate so the lock is only waited for once, at the start, instead of partway through the batch
+                with transaction(self.databasePath, immediate=True) as connection:
+                    for write, future in writes:
+                        connection.execute("SAVEPOINT WRITE")
+                        try:
+                            result = write()
+                        # BaseException, so that nothing a write raises can stop the writer thread
+                        except BaseException as error:
+                            # undo only this write
+                            connection.execute("ROLLBACK TO WRITE")
+                            connection.execute("RELEASE WRITE")
+                            results.append((future, None, error))
+                        else:
+                            connection.execute("RELEASE WRITE")
+                            results.append((future, result, None))
+            except BaseException as error:
+                # the transaction couldn't start or commit, so none of the batch was stored
+                results = [(future, None, error) for _, future in writes]
+
+        for future, result, error in results:
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+        # every write submitted before a flush has been reported now
+        for write, future in batch:
+            if write is FLUSH:
+                future.set_result(None)
+        return
+
+
+databaseWriters = PerDatabase(DatabaseWriter)
+
+def getDatabaseWriter(databasePath: str) -> DatabaseWriter:
+    """Returns the DatabaseWriter for the database at databasePath, creating it on first use."""
+    return databaseWriters.get(databasePath)
+
+@register
+def flushDatabaseWriters() -> None:
+    """
+    Waits until every write queued on any DatabaseWriter has been committed or has failed.\n
+    Registered to run when the program exits, because writer threads are daemons and would otherwise be stopped with writes that were already reported to students as done still queued.
+    """
+    for writer in databaseWriters.all():
+        # a writer that was never started has nothing queued, and threads can't be started while exiting
+        if writer.thread is None:
+            continue
+        try:
+            writer.flush()
+        except Exception:
+            # keep flushing the other writers
+            print_exc()
+    return
+
+def closeDatabaseWriter(databasePath: str) -> None:
+    """Waits for every write queued for the database at databasePath, then drops its DatabaseWriter, so nothing is written to it while exiting. For databases that are about to be deleted."""
+    writer = databaseWriters.remove(databasePath)
+    if writer is not None and writer.thread is not None:
+        writer.flush()
+    return
+
+class DataVersionWatcher:
+    """
+    Cheaply checks whether anything else has changed the database, so readers that poll it can skip reloading when nothing did.\n
+    Uses PRAGMA data_version, which costs no table reads, on a connection of its own, since the value only changes for commits made by other connections.\n
+    Attributes:\n
+        databasePath (str): path to the database,\n
+        connection (Connection): the connection data_version is read on, never used for anything else,\n
+        version (int): data_version when changed was last called
+    """
+    def __init__(self, databasePath: str) -> None:
+        self.databasePath = databasePath
+        # not pooled, data_version is only comparable when read on the same connection
+        self.connection = connect(databasePath, isolation_level=None)
+        self.version = self.readVersion()
+        return
+
+    def readVersion(self) -> int:
+        """Returns the current data_version of the connection."""
+        return self.connection.execute("PRAGMA data_version").fetchone()[0]
+
+    def changed(self) -> bool:
+        """Returns whether a commit has been made to the database, by any other connection in any process, since the watcher was created or this was last called."""
+        version = self.readVersion()
+        if version == self.version:
+            return False
+        self.version = version
+        return True
+
+    def close(self) -> None:
+        """Closes the watcher's connection."""
+        self.connection.close()
+        return
 
 def executeOnDatabase(databasePath: str, sql: str, replacements: Iterator = ()) -> list:
     """Executes the given sql with the given replacements on the database and returns the results of cursor.fetchall(). This can be used for committing, updating, or fetching."""
-    with connect(databasePath) as connection:
-        cursor = connection.cursor()
-        cursor.execute(sql, replacements)
-        results = cursor.fetchall()
-    # shouldn't be necessary because of context manager but is
-    connection.close()
-    return results
+    with getConnectionPool(databasePath).connection() as connection:
+        return connection.execute(sql, replacements).fetchall()
 
+def executeManyOnDatabase(databasePath: str, sql: str, replacementsList: Iterator[Iterator]) -> int:
+    """Executes the given sql once for each set of replacements in replacementsList, using cursor.executemany. Used for inserting or updating many rows at once. Returns the total number of rows modified."""
+    with getConnectionPool(databasePath).connection() as connection:
+        return connection.executemany(sql, replacementsList).rowcount
+
+def iterateOnDatabase(databasePath: str, sql: str, replacements: Iterator = (), batchSize: int = 1000) -> Iterator[tuple]:
+    """
+    Executes the given sql with the given replacements on the database and yields the resulting rows one at a time, fetching batchSize at a time with cursor.fetchmany.\n
+    Results of any size are read with constant memory, as long as the query doesn't need a sort. The connection stays checked out, and the rows are from a single snapshot of the database, until the iterator is exhausted or closed.
+    """
+    with getConnectionPool(databasePath).connection() as connection:
+        cursor = connection.execute(sql, replacements)
+        while len(rows := cursor.fetchmany(batchSize)) > 0:
+            yield from rows
+    return
+
+def uuidBlob(uuid: str | UUID) -> bytes:
+    """Returns uuid as the 16 bytes it is stored as in the database. All uuids are stored this way instead of as 36 character text."""
+    if isinstance(uuid, UUID):
+        return uuid.bytes
+    return UUID(uuid).bytes
+
+# the create functions make the original (version 0) tables, MIGRATIONS bring them up to date
 def createSessionTable(databasePath: str) -> None:
     """Creates the table for storing persistent Session data."""
     sql = '''CREATE TABLE SESSIONS(
@@ -56,8 +396,288 @@ def createVariableTable(databasePath: str) -> None:
     return
 
 def createDatabase(databasePath: str) -> None:
-    """Creates the database from blank, with no contained data. Should only be used if the database file does not currently exist."""
-    createSessionTable(databasePath)
-    createQuestionTable(databasePath)
-    createVariableTable(databasePath)
+    """Creates the database from blank, with no contained data, at the latest version. Should only be used if the database file does not currently exist."""
+    with transaction(databasePath):
+        createSessionTable(databasePath)
+        createQuestionTable(databasePath)
+        createVariableTable(databasePath)
+    migrateDatabase(databasePath)
+    return
+
+def deleteUnclaimedQuestions(databasePath: str) -> None:
+    """Deletes Questions, and their Variables, that were stored ahead of time for a Session that was never created. See QuestionSetPool."""
+    with transaction(databasePath):
+        sql = '''
+            DELETE FROM VARIABLES
+            WHERE QUESTION_UUID IN (
+                SELECT QUESTION_UUID FROM QUESTIONS
+                WHERE SESSION_UUID NOT IN (SELECT SESSION_UUID FROM SESSIONS)
+            )
+        '''
+        executeOnDatabase(databasePath, sql)
+        executeOnDatabase(databasePath, "DELETE FROM QUESTIONS WHERE SESSION_UUID NOT IN (SELECT SESSION_UUID FROM SESSIONS)")
+    return
+
+def addLookupIndexes(databasePath: str) -> None:
+    """Migration to version 1. Indexes the columns that Questions and Variables are looked up by when loading a Session."""
+    executeOnDatabase(databasePath, "CREATE INDEX QUESTIONS_SESSION_UUID_INDEX ON QUESTIONS(SESSION_UUID)")
+    executeOnDatabase(databasePath, "CREATE INDEX VARIABLES_QUESTION_UUID_INDEX ON VARIABLES(QUESTION_UUID)")
+    return
+
+def addAnswerColumn(databasePath: str) -> None:
+    """Migration to version 2. Stores each question's solved answer in QUESTIONS, filling it in for existing questions from their answer Variable."""
+    executeOnDatabase(databasePath, "ALTER TABLE QUESTIONS ADD COLUMN ANSWER FLOAT")
+    sql = '''
+        UPDATE QUESTIONS
+        SET ANSWER=(
+            SELECT VARIABLES.VALUE
+            FROM VARIABLES
+            WHERE
+                VARIABLES.QUESTION_UUID=QUESTIONS.QUESTION_UUID
+                AND lower(VARIABLES.VARIABLE_NAME)=lower(QUESTIONS.ANSWER_VARIABLE_NAME)
+        )
+    '''
+    executeOnDatabase(databasePath, sql)
+    return
+
+def addSeedColumns(databasePath: str) -> None:
+    """Migration to version 3. Stores the seed of Questions stored in compact form, and which question config each Question was generated from. Existing Questions keep their Variable rows."""
+    executeOnDatabase(databasePath, "ALTER TABLE QUESTIONS ADD COLUMN SEED INT")
+    executeOnDatabase(databasePath, "ALTER TABLE QUESTIONS ADD COLUMN CONFIG_KEY CHAR")
+    return
+
+def normalizeTables(databasePath: str) -> None:
+    """
+    Migration to version 4. Rebuilds SESSIONS, QUESTIONS and VARIABLES with uuids stored as 16 byte BLOBs instead of 36 character text.\n
+    The data that is the same for every student's copy of a question (or variable) moves into QUESTION_TEMPLATES (or VARIABLE_TEMPLATES), referenced by id, instead of being repeated in every row.
+    Rows are copied in their original order, which Questions and Variables are loaded in.
+    """
+    # only exists on this connection, which the whole migration runs on
+    with getConnectionPool(databasePath).connection() as connection:
+        connection.create_function("UUID_BLOB", 1, uuidBlob, deterministic=True)
+
+    sql = '''CREATE TABLE QUESTION_TEMPLATES(
+        TEMPLATE_ID INTEGER PRIMARY KEY,
+        QUESTION_TYPE CHAR NOT NULL,
+        ANSWER_VARIABLE_NAME CHAR NOT NULL,
+        CORRECT_LEEWAY FLOAT NOT NULL,
+        TEXT CHAR NOT NULL,
+        IMAGE_FILENAME CHAR NOT NULL,
+        CONFIG_KEY CHAR
+    )'''
+    executeOnDatabase(databasePath, sql)
+    sql = '''
+        INSERT INTO QUESTION_TEMPLATES (QUESTION_TYPE, ANSWER_VARIABLE_NAME, CORRECT_LEEWAY, TEXT, IMAGE_FILENAME, CONFIG_KEY)
+        SELECT DISTINCT QUESTION_TYPE, ANSWER_VARIABLE_NAME, CORRECT_LEEWAY, TEXT, IMAGE_FILENAME, CONFIG_KEY FROM QUESTIONS
+    '''
+    executeOnDatabase(databasePath, sql)
+
+    sql = '''CREATE TABLE VARIABLE_TEMPLATES(
+        VARIABLE_TEMPLATE_ID INTEGER PRIMARY KEY,
+        VARIABLE_NAME CHAR NOT NULL,
+        UNITS CHAR NOT NULL,
+        DISPLAY_NAME CHAR NOT NULL,
+        DECIMAL_PLACES INT NOT NULL
+    )'''
+    executeOnDatabase(databasePath, sql)
+    sql = '''
+        INSERT INTO VARIABLE_TEMPLATES (VARIABLE_NAME, UNITS, DISPLAY_NAME, DECIMAL_PLACES)
+        SELECT DISTINCT VARIABLE_NAME, UNITS, DISPLAY_NAME, DECIMAL_PLACES FROM VARIABLES
+    '''
+    executeOnDatabase(databasePath, sql)
+
+    sql = '''CREATE TABLE NEW_SESSIONS(
+        SESSION_UUID BLOB NOT NULL PRIMARY KEY,
+        FIRST_NAME CHAR NOT NULL,
+        LAST_NAME CHAR NOT NULL,
+        EMAIL CHAR NOT NULL
+    )'''
+    executeOnDatabase(databasePath, sql)
+    sql = '''
+        INSERT INTO NEW_SESSIONS (SESSION_UUID, FIRST_NAME, LAST_NAME, EMAIL)
+        SELECT UUID_BLOB(SESSION_UUID), FIRST_NAME, LAST_NAME, EMAIL FROM SESSIONS ORDER BY rowid
+    '''
+    executeOnDatabase(databasePath, sql)
+
+    sql = '''CREATE TABLE NEW_QUESTIONS(
+        QUESTION_UUID BLOB NOT NULL PRIMARY KEY,
+        SESSION_UUID BLOB NOT NULL,
+        TEMPLATE_ID INT NOT NULL,
+
+        NUMBER_TRIES INT NOT NULL,
+        CORRECT BOOL NOT NULL,
+        ACTIVE BOOL NOT NULL,
+        ANSWER FLOAT,
+        SEED INT
+    )'''
+    executeOnDatabase(databasePath, sql)
+    # IS instead of = so that NULL CONFIG_KEYs match
+    sql = '''
+        INSERT INTO NEW_QUESTIONS (QUESTION_UUID, SESSION_UUID, TEMPLATE_ID, NUMBER_TRIES, CORRECT, ACTIVE, ANSWER, SEED)
+        SELECT
+            UUID_BLOB(QUESTIONS.QUESTION_UUID),
+            UUID_BLOB(QUESTIONS.SESSION_UUID),
+            QUESTION_TEMPLATES.TEMPLATE_ID,
+            QUESTIONS.NUMBER_TRIES,
+            QUESTIONS.CORRECT,
+            QUESTIONS.ACTIVE,
+            QUESTIONS.ANSWER,
+            QUESTIONS.SEED
+        FROM QUESTIONS
+        JOIN QUESTION_TEMPLATES ON
+            QUESTION_TEMPLATES.QUESTION_TYPE IS QUESTIONS.QUESTION_TYPE
+            AND QUESTION_TEMPLATES.ANSWER_VARIABLE_NAME IS QUESTIONS.ANSWER_VARIABLE_NAME
+            AND QUESTION_TEMPLATES.CORRECT_LEEWAY IS QUESTIONS.CORRECT_LEEWAY
+            AND QUESTION_TEMPLATES.TEXT IS QUESTIONS.TEXT
+            AND QUESTION_TEMPLATES.IMAGE_FILENAME IS QUESTIONS.IMAGE_FILENAME
+            AND QUESTION_TEMPLATES.CONFIG_KEY IS QUESTIONS.CONFIG_KEY
+        ORDER BY QUESTIONS.rowid
+    '''
+    executeOnDatabase(databasePath, sql)
+
+    sql = '''CREATE TABLE NEW_VARIABLES(
+        VARIABLE_UUID BLOB NOT NULL PRIMARY KEY,
+        QUESTION_UUID BLOB NOT NULL,
+        VARIABLE_TEMPLATE_ID INT NOT NULL,
+        VALUE FLOAT NOT NULL
+    )'''
+    executeOnDatabase(databasePath, sql)
+    sql = '''
+        INSERT INTO NEW_VARIABLES (VARIABLE_UUID, QUESTION_UUID, VARIABLE_TEMPLATE_ID, VALUE)
+        SELECT
+            UUID_BLOB(VARIABLES.VARIABLE_UUID),
+            UUID_BLOB(VARIABLES.QUESTION_UUID),
+            VARIABLE_TEMPLATES.VARIABLE_TEMPLATE_ID,
+            VARIABLES.VALUE
+        FROM VARIABLES
+        JOIN VARIABLE_TEMPLATES ON
+            VARIABLE_TEMPLATES.VARIABLE_NAME IS VARIABLES.VARIABLE_NAME
+            AND VARIABLE_TEMPLATES.UNITS IS VARIABLES.UNITS
+            AND VARIABLE_TEMPLATES.DISPLAY_NAME IS VARIABLES.DISPLAY_NAME
+            AND VARIABLE_TEMPLATES.DECIMAL_PLACES IS VARIABLES.DECIMAL_PLACES
+        ORDER BY VARIABLES.rowid
+    '''
+    executeOnDatabase(databasePath, sql)
+
+    # dropping the old tables drops their indexes too
+    for table in ("SESSIONS", "QUESTIONS", "VARIABLES"):
+        executeOnDatabase(databasePath, f"DROP TABLE {table}")
+        executeOnDatabase(databasePath, f"ALTER TABLE NEW_{table} RENAME TO {table}")
+    addLookupIndexes(databasePath)
+    return
+
+def addAttemptsTable(databasePath: str) -> None:
+    """Migration to version 5. Adds the table every submission is recorded in, see Attempt. Submissions made before this version were not recorded."""
+    sql = '''CREATE TABLE ATTEMPTS(
+        QUESTION_UUID BLOB NOT NULL,
+        VALUE FLOAT NOT NULL,
+        CORRECT BOOL NOT NULL,
+        SUBMITTED_AT FLOAT NOT NULL
+    )'''
+    executeOnDatabase(databasePath, sql)
+    executeOnDatabase(databasePath, "CREATE INDEX ATTEMPTS_QUESTION_UUID_INDEX ON ATTEMPTS(QUESTION_UUID)")
+    return
+
+def addRevisionColumns(databasePath: str) -> None:
+    """
+    Migration to version 6. Gives every Session and Question a REVISION, so readers can fetch only the rows changed since they last read.\n
+    REVISIONS holds the last revision given out, which only ever increases, and the revision of the last clearDatabase, after which readers have to fetch everything again.
+    Triggers give a row the next revision when it is inserted, and when the columns shown in the admin app change. Existing rows have revision 0.
+    """
+    sql = '''CREATE TABLE REVISIONS(
+        REVISION INT NOT NULL,
+        CLEARED_REVISION INT NOT NULL
+    )'''
+    executeOnDatabase(databasePath, sql)
+    executeOnDatabase(databasePath, "INSERT INTO REVISIONS (REVISION, CLEARED_REVISION) VALUES (0, 0)")
+
+    executeOnDatabase(databasePath, "ALTER TABLE SESSIONS ADD COLUMN REVISION INT NOT NULL DEFAULT 0")
+    executeOnDatabase(databasePath, "ALTER TABLE QUESTIONS ADD COLUMN REVISION INT NOT NULL DEFAULT 0")
+    executeOnDatabase(databasePath, "CREATE INDEX SESSIONS_REVISION_INDEX ON SESSIONS(REVISION)")
+    executeOnDatabase(databasePath, "CREATE INDEX QUESTIONS_REVISION_INDEX ON QUESTIONS(REVISION)")
+    # changed students are looked up by name, so other Sessions with the same name are found without a scan
+    executeOnDatabase(databasePath, "CREATE INDEX SESSIONS_NAME_INDEX ON SESSIONS(FIRST_NAME, LAST_NAME, EMAIL)")
+
+    for table in ("SESSIONS", "QUESTIONS"):
+        sql = f'''CREATE TRIGGER {table}_INSERT_REVISION AFTER INSERT ON {table}
+        BEGIN
+            UPDATE REVISIONS SET REVISION=REVISION+1;
+            UPDATE {table} SET REVISION=(SELECT REVISION FROM REVISIONS) WHERE rowid=NEW.rowid;
+        END'''
+        executeOnDatabase(databasePath, sql)
+
+    # setting REVISION doesn't fire this again, it only watches NUMBER_TRIES and CORRECT
+    sql = '''CREATE TRIGGER QUESTIONS_UPDATE_REVISION AFTER UPDATE OF NUMBER_TRIES, CORRECT ON QUESTIONS
+    WHEN OLD.NUMBER_TRIES IS NOT NEW.NUMBER_TRIES OR OLD.CORRECT IS NOT NEW.CORRECT
+    BEGIN
+        UPDATE REVISIONS SET REVISION=REVISION+1;
+        UPDATE QUESTIONS SET REVISION=(SELECT REVISION FROM REVISIONS) WHERE rowid=NEW.rowid;
+    END'''
+    executeOnDatabase(databasePath, sql)
+    return
+
+# the function at each index upgrades a database from that version (stored in PRAGMA user_version) to the next one
+# databases made before versioning was added are version 0
+# new migrations must only ever be appended, existing databases rely on the order
+MIGRATIONS = [
+    addLookupIndexes,
+    addAnswerColumn,
+    addSeedColumns,
+    normalizeTables,
+    addAttemptsTable,
+    addRevisionColumns
+]
+
+def getDatabaseVersion(databasePath: str) -> int:
+    """Returns the schema version of the database, the number of MIGRATIONS that have been applied to it."""
+    return executeOnDatabase(databasePath, "PRAGMA user_version")[0][0]
+
+def migrateDatabase(databasePath: str) -> None:
+    """
+    Upgrades the database in place to the latest version, keeping all stored data, by applying every migration in MIGRATIONS it does not have yet.\n
+    Creates the tables first if the database is empty or does not exist. Safe to call every time the program starts, a database that is already up to date isn't written to.\n
+    Raises a RuntimeError if the database was made by a newer version of physqgen, which this version can't use.
+    """
+    # read without taking the write lock, since there is normally nothing to do
+    if checkDatabaseVersion(databasePath) == len(MIGRATIONS):
+        return
+
+    # immediate, so the server and admin app starting at the same time can't both apply the same migration
+    with transaction(databasePath, immediate=True):
+        if len(executeOnDatabase(databasePath, "SELECT NAME FROM sqlite_master WHERE NAME='SESSIONS'")) == 0:
+            createSessionTable(databasePath)
+            createQuestionTable(databasePath)
+            createVariableTable(databasePath)
+
+        # checked again, another process may have migrated it since the read above
+        version = checkDatabaseVersion(databasePath)
+        if version == len(MIGRATIONS):
+            return
+        for migration in MIGRATIONS[version:]:
+            migration(databasePath)
+        # pragmas can't use replacements, len is always an int
+        executeOnDatabase(databasePath, f"PRAGMA user_version={len(MIGRATIONS)}")
+    return
+
+def checkDatabaseVersion(databasePath: str) -> int:
+    """Returns the schema version of the database, see getDatabaseVersion. Raises a RuntimeError if it is newer than the latest version this code knows about."""
+    version = getDatabaseVersion(databasePath)
+    if version > len(MIGRATIONS):
+        raise RuntimeError(f"Database {databasePath} is version {version}, newer than the latest supported version {len(MIGRATIONS)}. Update physqgen to use it.")
+    return version
+
+def clearDatabase(databasePath: str) -> None:
+    """
+    Deletes all stored student data, leaving the empty tables in place.\n
+    Rows are deleted instead of removing the file because the server keeps its connections open, and would keep using a deleted file (or its leftover WAL file).
+    QUESTION_TEMPLATES and VARIABLE_TEMPLATES are kept. They are small, and Questions being written while this runs may refer to them.
+    REVISIONS is kept too, so revisions are never reused, and records the clear so readers of changes know to fetch everything again.
+    """
+    with transaction(databasePath):
+        executeOnDatabase(databasePath, "DELETE FROM ATTEMPTS")
+        executeOnDatabase(databasePath, "DELETE FROM VARIABLES")
+        executeOnDatabase(databasePath, "DELETE FROM QUESTIONS")
+        executeOnDatabase(databasePath, "DELETE FROM SESSIONS")
+        # both are set from the old REVISION
+        executeOnDatabase(databasePath, "UPDATE REVISIONS SET REVISION=REVISION+1, CLEARED_REVISION=REVISION+1")
     return
@@ -1,26 +1,87 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from hashlib import sha256
 
-from physqgen.generator.question import QUESTION_CONSTRUCTORS
+from physqgen.generator.question import QUESTION_CONFIGS, QUESTION_CONSTRUCTORS
+from physqgen.generator.solvers import Solver, getSolver
+from physqgen.generator.variable import Variable
 
 
-@dataclass(slots=True)
+@dataclass(frozen=True, slots=True)
 class QuestionConfig:
     """
     Configuration for a specific question in a configuration. Can be used to generate a Question with randomized Variables.\n
+    Verified and compiled when created, so generating Questions from it only needs to draw random values. Immutable once created.\n
     Attributes:\n
         See Question for attributes, excluding class variable, which is instead stored in the questionType instance variable\n
-            variables is also replaced by variablesConfigs, which hold VariblesConfig objects instead of Variable objects\n
-            does not have a uuid
+            variables is also replaced by variablesConfigs, a tuple which holds VariblesConfig objects instead of Variable objects\n
+            does not have a uuid\n
+        compactStorage (bool): whether generated Questions are stored in compact form, with a seed instead of a row per Variable, see Question.addSeededVariables,\n
+        solver (Solver): formula for the answer from the configured variables, picked once when the config is loaded,\n
+        configKey (str): identifies this configuration, stored with each generated Question. The same configuration has the same key every time it is loaded
     """
-    variableConfigs: list # list[VariableConfig], can't annotate because of circular references
+    variableConfigs: tuple # tuple[VariableConfig, ...], can't annotate because of circular references
     answerVariableName: str
     questionType: str
     text: str
     imageFilename: str
     # default was agreed upon with client at 10%
     correctLeeway: float = 0.1
+    compactStorage: bool = False
+    solver: Solver = field(init=False, repr=False, compare=False)
+    configKey: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """
+        Verifies every VariableConfig, alone and in the context of the others, picks the solver for this configuration, and registers it in QUESTION_CONFIGS under its configKey.\n
+        Raises a ValueError if the configuration is invalid or the answer can't be solved for from the configured variables.
+        """
+        if self.questionType not in QUESTION_CONSTRUCTORS:
+            raise ValueError(f"Unknown questionType {self.questionType}. See question types docs for valid types.")
+
+        # frozen dataclasses have to go through object to set attributes
+        object.__setattr__(self, "variableConfigs", tuple(self.variableConfigs))
+
+        for variableConfig in self.variableConfigs:
+            Variable.verifyConfig(variableConfig, self)
+
+        object.__setattr__(
+            self,
+            "solver",
+            getSolver(
+                self.questionType,
+                frozenset(variableConfig.variableName for variableConfig in self.variableConfigs),
+                self.answerVariableName.lower()
+            )
+        )
+
+        # only what affects generated Questions is included, so changing the config changes the key
+        # compact Questions from an old version of a config then fail to load instead of silently getting different values
+        identity = (
+            self.questionType,
+            self.answerVariableName,
+            self.text,
+            self.imageFilename,
+            self.correctLeeway,
+            tuple(
+                (
+                    variableConfig.variableName,
+                    variableConfig.range,
+                    variableConfig.units,
+                    variableConfig.displayName,
+                    variableConfig.decimalPlaces
+                )
+                for variableConfig in self.variableConfigs
+            )
+        )
+        object.__setattr__(self, "configKey", sha256(repr(identity).encode()).hexdigest()[:16])
+        QUESTION_CONFIGS[self.configKey] = self
+        return
 
     def getRandomQuestion(self):
         """Generates a Question with random Variables based on this configuration."""
         # creates the class coresponding to questionType, with the values from the config
         return QUESTION_CONSTRUCTORS[self.questionType].fromConfig(self)
+
+    def getRandomQuestions(self, number: int) -> list:
+        """Generates number Questions with random Variables based on this configuration, in one batch. See Question.manyFromConfig."""
+        return QUESTION_CONSTRUCTORS[self.questionType].manyFromConfig(self, number)
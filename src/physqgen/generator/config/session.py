@@ -8,32 +8,44 @@ from physqgen.generator.config.question import QuestionConfig
 from physqgen.generator.config.variable import VariableConfig
 
 
-@dataclass(slots=True)
+@dataclass(frozen=True, slots=True)
 class Config:
     """
-    The configuration for question generation. Allows random generation of question as per the configuration file specified.\n
+    The configuration for question generation. Allows random generation of question as per the configuration file specified. Immutable once created.\n
     Attributes:\n
-        questionConfigs (list[QuestionConfig]): configurations for each question
+        questionConfigs (tuple[QuestionConfig, ...]): configurations for each question
     """
-    questionConfigs: list[QuestionConfig]
+    questionConfigs: tuple[QuestionConfig, ...]
 
     @classmethod
     def fromFile(cls, dict: dict[str, list[dict]]):
-        """Creates a config from a loaded json-formatted config file."""
+        """Creates a config from a loaded json-formatted config file. All verification happens here, raising a ValueError if any question is configured incorrectly."""
+        # optional, applies to every question in the file
+        compactStorage = dict.get("compactStorage", False)
+
         qConfigs = []
         for question in dict["questions"]:
             vConfigs = []
             # use pop to remore the value that doesn't need to go to questionconfig constructor
             for varType, data in question.pop("variableConfig").items():
                 vConfigs.append(VariableConfig(varType, **data))
-            qConfigs.append(QuestionConfig(vConfigs, **question))
+            qConfigs.append(QuestionConfig(vConfigs, compactStorage=compactStorage, **question))
         
-        return cls(qConfigs)
+        return cls(tuple(qConfigs))
 
     def generateQuestions(self) -> list:
         """Returns the list of question subclass instances with randomized Variable values."""
         return [questionConfig.getRandomQuestion() for questionConfig in self.questionConfigs]
 
+    def generateBatch(self, number: int) -> list[list]:
+        """
+        Returns number lists of question subclass instances with randomized Variable values, each the same as a list from generateQuestions.\n
+        Much faster than calling generateQuestions number times, for pre-generating questions for many students at once.
+        """
+        # one column of questions per question config, turned into one row of questions per student
+        questionColumns = [questionConfig.getRandomQuestions(number) for questionConfig in self.questionConfigs]
+        return [list(questions) for questions in zip(*questionColumns)]
+
 def copyQuestionImagesToServerFolder(imageFolderPath: str, movedImagesPath: str) -> None:
     """Copies files from imageFolderPath to movedImagesPath. This is intended to make image files available to ber displayed on the server, if they are referenced in any configs."""
     # for the pathname-matching quick solution: https://stackoverflow.com/questions/11903037/copy-all-jpg-file-in-a-directory-to-another-directory-in-python
@@ -42,7 +54,7 @@ def copyQuestionImagesToServerFolder(imageFolderPath: str, movedImagesPath: str)
             shcopy(join(sourcePath, originalFileName), movedFilePath)
 
 def registerConfig(configFolderPath: str) -> Config:
-    """Stores the current Config for duration of program run."""
+    """Stores the current Config for duration of program run. Raises a ValueError if it is configured incorrectly, so mistakes are found when the program starts."""
     # get config on run
     global appConfig
     with open(join(configFolderPath, "active_config.json")) as file:
@@ -1,20 +1,26 @@
 from dataclasses import dataclass
 
 
-@dataclass(slots=True)
+@dataclass(frozen=True, slots=True)
 class VariableConfig:
     """
-    Configuration for a specific variable in a Question. Can be used to generate random Variables.\n
+    Configuration for a specific variable in a Question. Can be used to generate random Variables. Immutable once created.\n
     Attributes:\n
-        range is a list containing the upper and lower bounds the value should be randomized within,\n
+        range is a tuple containing the upper and lower bounds the value should be randomized within,\n
         See Variable class for remaining attributes\n
             does not have a uuid
     """
     variableName: str
-    range: list[float | int]
+    range: tuple[float | int, float | int]
     units: str
     displayName: str
     decimalPlaces: int = 3
+
+    def __post_init__(self) -> None:
+        """Converts range, which is loaded as a list, to a tuple so it can't be changed."""
+        # frozen dataclasses have to go through object to set attributes
+        object.__setattr__(self, "range", tuple(self.range))
+        return
     
     def nonZero(self) -> bool:
         """Checks if the configured range is allowed, disallowing it from including 0.0. Returns True if valid, False if not valid."""
@@ -1,17 +1,21 @@
+from concurrent.futures import Future
 from dataclasses import dataclass, field
-from math import sqrt
+from functools import partial
 from typing import Literal
 from uuid import UUID, uuid4  # uuid4 doesn't include private information
 
-from physqgen.database import executeOnDatabase
-from physqgen.generator.variable import Variable
+from physqgen.attempt import Attempt
+from physqgen.database import (executeManyOnDatabase, executeOnDatabase,
+                                getDatabaseWriter, transaction, uuidBlob)
+from physqgen.generator.solvers import getSolver
+from physqgen.generator.variable import Variable, randomSeeds, randomUUIDs
 
 
 @dataclass(slots=True)
 class Question:
     """
     Base class for all question types. Can be generated from a configuration, which creates a question with random Variables, or from stored data.\n
-    Subclasses should implement snake case properties for each variable they involve, which pull the value if it is set or solve for it if not. See KinematicsQuestion for an example.\n
+    Subclasses should add formulas for each variable they involve to SOLVERS in solvers.py, and implement snake case properties for them which call solve. See KinematicsQuestion for an example.\n
     Subclasses need to include valid variables in docs.\n
     Subclasses can also have verification, handled separately, see VERIFICATION_METHODS in variables.py.\n
     Attributes:\n
@@ -23,7 +27,12 @@ class Question:
         numberTries (int): number of submissions checked,\n
         correct (bool): whether the question has been completed,\n
         active (bool): used in conjunction with correct for completion tracking,\n
+        answer (float | None): the solved value of the answer variable, computed once on generation and stored with the question so grading never needs to solve it again,\n
+        seed (int | None): for Questions stored in compact form, the seed their Variable values were drawn with, see Variable.seededValues. None for Questions stored with a row per Variable,\n
+        configKey (str | None): the configKey of the QuestionConfig this Question was generated from, None for Questions generated before it was stored,\n
         uuid (UUID): unique question uuid,\n
+        variableIndex (dict[str, Variable]): the Variables in variables keyed by variableName, for constant time lookup in getValue. Add Variables with addVariable so it stays in sync,\n
+        savedState (tuple | None): numberTries, correct and active as they were last loaded from or written to the database, None if never stored,\n
         questionType (str): identifier for question subclass, used as a key in the QUESTION_CONSTRUCTORS dict, needs to be overriden in subclasses and added to said dict
     """
     answerVariableName: str
@@ -35,18 +44,42 @@ class Question:
     numberTries: int = 0
     correct: bool = False
     active: bool = False
+    answer: float | None = None
+    seed: int | None = None
+    configKey: str | None = None
 
     uuid: UUID = field(default_factory=uuid4)
+    variableIndex: dict[str, Variable] = field(init=False, repr=False, compare=False)
+    savedState: tuple[int, bool, bool] | None = field(default=None, init=False, repr=False, compare=False)
 
     # needs to be overriden in inheriting classes
     questionType = ""
 
+    def __post_init__(self) -> None:
+        """Builds variableIndex from the passed variables."""
+        self.variableIndex = {}
+        for variable in self.variables:
+            # the first Variable with a name is the one found, as with the previous linear search
+            self.variableIndex.setdefault(variable.variableName, variable)
+        return
+
+    def addVariable(self, variable: Variable) -> None:
+        """Adds variable to variables and variableIndex."""
+        self.variables.append(variable)
+        self.variableIndex.setdefault(variable.variableName, variable)
+        return
+
     @classmethod
     def fromConfig(_, questionConfig):
         """Creates an randomized instance of cls from the passed questionConfig (QuestionConfig)."""
-        variables: list[Variable] = []
-        for varConfig in questionConfig.variableConfigs:
-            variables.append(Variable.fromConfig(varConfig, questionConfig))
+        if questionConfig.compactStorage:
+            seed = randomSeeds(1)[0]
+            variables = Variable.manyFromSeed(questionConfig.variableConfigs, seed)
+        else:
+            seed = None
+            variables: list[Variable] = []
+            for varConfig in questionConfig.variableConfigs:
+                variables.append(Variable.fromConfig(varConfig))
 
         # get the subclass constructor
         questionClass = QUESTION_CONSTRUCTORS[questionConfig.questionType]
@@ -56,19 +89,87 @@ class Question:
             variables=variables,
             correctLeeway=questionConfig.correctLeeway,
             imageFilename=questionConfig.imageFilename,
-            text=questionConfig.text
+            text=questionConfig.text,
+            seed=seed,
+            configKey=questionConfig.configKey
         )
 
+        # solved once here with the formula picked when the config was loaded, grading uses the stored value
+        question.answer = questionConfig.solver({variable.variableName: variable.value for variable in variables})
+
         # add a variable for the answer to the question
-        question.variables.append(
+        question.addVariable(
             Variable(
                 variableName=questionConfig.answerVariableName,
-                # this is where all the properties added to subclasses are actually used to get answer
-                value=getattr(question, questionConfig.answerVariableName.lower())
+                value=question.answer
             )
         )
 
         return question
+
+    @staticmethod
+    def manyFromConfig(questionConfig, number: int) -> list:
+        """
+        Creates number randomized Questions (list[Question]) from the passed questionConfig (QuestionConfig) at once, for generating many sessions together.\n
+        Values are drawn a variable at a time into columns, and every answer is solved with one pass of the config's solver over those columns, before any objects are built.
+        """
+        if questionConfig.compactStorage:
+            # each question's values are drawn from its own seed, so they can be drawn again when it is loaded
+            seeds = randomSeeds(number)
+            rows = [Variable.seededValues(questionConfig.variableConfigs, seed) for seed in seeds]
+            columns = {
+                varConfig.variableName: [values[index] for values in rows]
+                for index, varConfig in enumerate(questionConfig.variableConfigs)
+            }
+        else:
+            seeds = [None] * number
+            columns = {
+                varConfig.variableName: Variable.randomizeValues(varConfig.range, number)
+                for varConfig in questionConfig.variableConfigs
+            }
+        solver = questionConfig.solver
+        answers = list(map(solver.formula, *[columns[name] for name in solver.variableNames]))
+
+        # get the subclass constructor
+        questionClass = QUESTION_CONSTRUCTORS[questionConfig.questionType]
+
+        # one for each question, then one for each of its variables, including the answer variable
+        uuids = iter(randomUUIDs(number * (len(questionConfig.variableConfigs) + 2)))
+
+        questions = []
+        for index, answer in enumerate(answers):
+            question = questionClass(
+                answerVariableName=questionConfig.answerVariableName.lower(),
+                variables=[
+                    Variable(
+                        variableName=varConfig.variableName,
+                        value=columns[varConfig.variableName][index],
+                        units=varConfig.units,
+                        displayName=varConfig.displayName,
+                        decimalPlaces=varConfig.decimalPlaces,
+                        uuid=next(uuids)
+                    )
+                    for varConfig in questionConfig.variableConfigs
+                ],
+                correctLeeway=questionConfig.correctLeeway,
+                imageFilename=questionConfig.imageFilename,
+                text=questionConfig.text,
+                answer=answer,
+                seed=seeds[index],
+                configKey=questionConfig.configKey,
+                uuid=next(uuids)
+            )
+            # add a variable for the answer to the question
+            question.addVariable(
+                Variable(
+                    variableName=questionConfig.answerVariableName,
+                    value=answer,
+                    uuid=next(uuids)
+                )
+            )
+            questions.append(question)
+
+        return questions
     
     @classmethod
     def fromDatabase(_, databasePath: str, questionUUID: str | UUID):
@@ -76,87 +177,162 @@ class Question:
         Returns the appropriate Question subclass for data in the database coresponding to the given uuid.\n
         Does not use the class it is called on directly. This is still marked as a classmethod because it fulfills the purpose of one, constructing an instance of the class, except it will search for the appropriate subclass instead.
         """
-        sql = '''
-            SELECT
-                QUESTION_TYPE,
-                ANSWER_VARIABLE_NAME,
-                CORRECT_LEEWAY,
-                TEXT,
-                IMAGE_FILENAME,
-
-                NUMBER_TRIES,
-                CORRECT,
-                ACTIVE
-            FROM QUESTIONS WHERE QUESTION_UUID=?
-        '''
-        replacements = (str(questionUUID),)
-        
         # index 0 to get the unique question with the given uuid
         # will error if the database has been cleared since the session was created
         # let it error to prevent other issues
         # should never error, given other things should error first, so don't include it in docstring
-        results = executeOnDatabase(databasePath, sql, replacements)[0]
-
-        # get the constructor object for the appropriate question subclass object
-        questionClass = QUESTION_CONSTRUCTORS[results[0]]
-
-        return questionClass(
-            answerVariableName=results[1].lower(),
-            variables=Question.getAllVariables(databasePath, questionUUID),
-            correctLeeway=results[2],
-            text=results[3],
-            imageFilename=results[4],
-            numberTries=results[5],
-            correct=results[6],
-            active=results[7],
-            uuid=questionUUID
-        )
+        return Question.manyFromDatabase(databasePath, "QUESTION_UUID", questionUUID)[0]
+
+    @staticmethod
+    def manyFromDatabase(databasePath: str, filterColumn: str | None, uuid: str | UUID | None = None) -> list:
+        """
+        Loads every Question (list[Question]) whose filterColumn ("QUESTION_UUID" or "SESSION_UUID") in the QUESTIONS table matches uuid, in the order they were added. If filterColumn is None, every stored Question is loaded.\n
+        The questions and all of their Variables are fetched with a single joined query and assembled in memory.
+        Questions stored in compact form have no Variable rows, their Variables are drawn again from their seed, see addSeededVariables.
+        """
+        if filterColumn not in ("QUESTION_UUID", "SESSION_UUID", None):
+            raise ValueError(f"Cannot load questions by column {filterColumn}.")
+
+        sql = f'''
+            SELECT
+                QUESTIONS.QUESTION_UUID,
+                QUESTION_TEMPLATES.QUESTION_TYPE,
+                QUESTION_TEMPLATES.ANSWER_VARIABLE_NAME,
+                QUESTION_TEMPLATES.CORRECT_LEEWAY,
+                QUESTION_TEMPLATES.TEXT,
+                QUESTION_TEMPLATES.IMAGE_FILENAME,
+
+                QUESTIONS.NUMBER_TRIES,
+                QUESTIONS.CORRECT,
+                QUESTIONS.ACTIVE,
+                QUESTIONS.ANSWER,
+
+                VARIABLES.VARIABLE_UUID,
+                VARIABLE_TEMPLATES.VARIABLE_NAME,
+                VARIABLES.VALUE,
+                VARIABLE_TEMPLATES.UNITS,
+                VARIABLE_TEMPLATES.DISPLAY_NAME,
+                VARIABLE_TEMPLATES.DECIMAL_PLACES,
+
+                QUESTIONS.SEED,
+                QUESTION_TEMPLATES.CONFIG_KEY
+            FROM QUESTIONS
+            JOIN QUESTION_TEMPLATES ON QUESTION_TEMPLATES.TEMPLATE_ID=QUESTIONS.TEMPLATE_ID
+            LEFT JOIN VARIABLES ON VARIABLES.QUESTION_UUID=QUESTIONS.QUESTION_UUID
+            LEFT JOIN VARIABLE_TEMPLATES ON VARIABLE_TEMPLATES.VARIABLE_TEMPLATE_ID=VARIABLES.VARIABLE_TEMPLATE_ID
+            {"" if filterColumn is None else f"WHERE QUESTIONS.{filterColumn}=?"}
+            ORDER BY QUESTIONS.rowid, VARIABLES.rowid
+        '''
+        replacements = () if filterColumn is None else (uuidBlob(uuid),)
+        results = executeOnDatabase(databasePath, sql, replacements)
+
+        # rows are grouped by question because of the ordering, each question has one row per variable
+        questions: dict[bytes, Question] = {}
+        for row in results:
+            try:
+                question = questions[row[0]]
+            except KeyError:
+                # get the constructor object for the appropriate question subclass object
+                questionClass = QUESTION_CONSTRUCTORS[row[1]]
+                question = questions[row[0]] = questionClass(
+                    answerVariableName=row[2].lower(),
+                    variables=[],
+                    correctLeeway=row[3],
+                    text=row[4],
+                    imageFilename=row[5],
+                    numberTries=row[6],
+                    correct=row[7],
+                    active=row[8],
+                    answer=row[9],
+                    seed=row[16],
+                    configKey=row[17],
+                    uuid=UUID(bytes=row[0])
+                )
+                if question.seed is not None:
+                    question.addSeededVariables()
+
+            # compact questions have no Variable rows, so their joined columns are all NULL
+            if row[10] is None:
+                continue
+            question.addVariable(
+                Variable(
+                    variableName=row[11],
+                    value=row[12],
+                    units=row[13],
+                    displayName=row[14],
+                    decimalPlaces=row[15],
+                    uuid=UUID(bytes=row[10])
+                )
+            )
+
+        for question in questions.values():
+            question.markSaved()
+        return list(questions.values())
     
+    def addSeededVariables(self) -> None:
+        """
+        For a Question stored in compact form, draws its Variables again from seed and takes its text and imageFilename from the QuestionConfig it was generated from, which is found by configKey.\n
+        Raises a ValueError if that QuestionConfig isn't loaded, which happens if the config was changed after the Question was stored.
+        """
+        try:
+            questionConfig = QUESTION_CONFIGS[self.configKey]
+        except KeyError:
+            raise ValueError(f"Question {self.uuid} is stored in compact form, but the question config it was generated from is no longer loaded. See Configuration Files docs for changing configs.")
+
+        self.text = questionConfig.text
+        self.imageFilename = questionConfig.imageFilename
+        for variable in Variable.manyFromSeed(questionConfig.variableConfigs, self.seed):
+            self.addVariable(variable)
+        # add a variable for the answer, as generation does
+        self.addVariable(
+            Variable(
+                variableName=questionConfig.answerVariableName,
+                value=self.answer
+            )
+        )
+        return
+
     @staticmethod
     def getAllVariables(databasePath: str, questionUUID: str | UUID) -> list[Variable]:
         """Constructs a list of all the Variables in the database which corespond to the passed questionUUID."""
-        sql = '''SELECT VARIABLE_UUID FROM VARIABLES WHERE QUESTION_UUID=?'''
-        replacements = (questionUUID,)
-        results = executeOnDatabase(databasePath, sql, replacements)
-        if len(results) == 0:
+        try:
+            return Question.fromDatabase(databasePath, questionUUID).variables
+        except IndexError:
             # could happen if the database has been cleared since creation
             # should error on other things first, but check just in case
             # because this should never run, don't include it in docstring
             raise RuntimeError("Session has been cleared. Cannot load data.")
 
-        variables = []
-        for uuid in results:
-            # unpack the row tuples, each have a single element
-            uuid = uuid[0]
-            variables.append(Variable.fromDatabase(databasePath, uuid))
-
-        return variables
-
-    @property
-    def answer(self) -> float:
-        """Returns the answer to the question given the randomized variable values."""
-        # if returns False, didn't get answer
-        ans = self.getValue(self.answerVariableName)
-        if type(ans) == float:
-            return ans
-        raise RuntimeError(f"Fetching answer for question {self} failed.")
-
     def checkSubmission(self, submitted: float) -> bool:
-        """Returns whether or not the submitted answer is within the allowed variance (0.1=10%) from the question's calculated answer."""
-        firstBound = self.answer*(1-self.correctLeeway)
-        secondBound = self.answer*(1+self.correctLeeway)
+        """Returns whether or not the submitted answer is within the allowed variance (0.1=10%) from the question's stored answer."""
+        return Question.withinLeeway(self.answer, self.correctLeeway, submitted)
+
+    @staticmethod
+    def withinLeeway(answer: float, correctLeeway: float, submitted: float) -> bool:
+        """Returns whether or not submitted is within the allowed factor variance correctLeeway from answer. Used by checkSubmission, and to grade without a Question, see grading.py."""
+        firstBound = answer*(1-correctLeeway)
+        secondBound = answer*(1+correctLeeway)
         # needs two checks, one for if the answer is negative and one if positive
-        if self.answer < 0:
+        if answer < 0:
             return bool(submitted < firstBound and submitted > secondBound)
         else:
             return bool(submitted > firstBound and submitted < secondBound)
     
+    def solve(self, variableName: str) -> float:
+        """Returns the value of the variable named variableName if it is set, otherwise solves for it from the set variables using the formula in SOLVERS."""
+        variable = self.variableIndex.get(variableName)
+        if variable is not None:
+            return variable.value
+
+        solver = getSolver(self.questionType, frozenset(self.variableIndex), variableName)
+        return solver.formula(*[self.variableIndex[name].value for name in solver.variableNames])
+
     def getValue(self, name: str) -> float | Literal[False]:
         """Returns the value for passed variable name, or False if there is no set variable in the current question with that name."""
-        for var in self.variables:
-            if var.variableName == name:
-                return var.value
-        return False
+        variable = self.variableIndex.get(name)
+        if variable is None:
+            return False
+        return variable.value
 
     @property
     def questionFrontendData(self) -> dict:
@@ -173,20 +349,92 @@ class Question:
             "imageFilename": self.imageFilename
         }
     
-    def addToDatabase(self, databasePath: str, sessionUUID: str | UUID) -> None:
-        """Adds this Questions data to the databse, including contained Variables."""
+    @property
+    def templateRow(self) -> tuple:
+        """The data of this Question that is the same for every student given it, stored once in QUESTION_TEMPLATES. See templateIds."""
+        return (
+            self.questionType,
+            self.answerVariableName,
+            self.correctLeeway,
+            self.text,
+            self.imageFilename,
+            self.configKey
+        )
+
+    @staticmethod
+    def templateIds(databasePath: str, questions: list) -> list[int]:
+        """Returns the id of the row in QUESTION_TEMPLATES matching the templateRow of each of the passed Questions (list[Question]), adding any that aren't stored yet. Should be called inside a transaction."""
+        # IS instead of = so that a NULL CONFIG_KEY matches
+        selectSQL = '''
+            SELECT TEMPLATE_ID
+            FROM QUESTION_TEMPLATES
+            WHERE
+                QUESTION_TYPE=?
+                AND ANSWER_VARIABLE_NAME=?
+                AND CORRECT_LEEWAY=?
+                AND TEXT=?
+                AND IMAGE_FILENAME=?
+                AND CONFIG_KEY IS ?
+        '''
+        insertSQL = '''
+            INSERT INTO QUESTION_TEMPLATES (
+                QUESTION_TYPE,
+                ANSWER_VARIABLE_NAME,
+                CORRECT_LEEWAY,
+                TEXT,
+                IMAGE_FILENAME,
+                CONFIG_KEY
+            ) VALUES (
+                ?,
+                ?,
+                ?,
+                ?,
+                ?,
+                ?
+            ) RETURNING TEMPLATE_ID
+        '''
+        # a whole session's questions usually share only a few templates, look each up once
+        templateIds: dict[tuple, int] = {}
+        for question in questions:
+            templateRow = question.templateRow
+            if templateRow not in templateIds:
+                results = executeOnDatabase(databasePath, selectSQL, templateRow)
+                if len(results) == 0:
+                    results = executeOnDatabase(databasePath, insertSQL, templateRow)
+                templateIds[templateRow] = results[0][0]
+
+        return [templateIds[question.templateRow] for question in questions]
+
+    def databaseRow(self, sessionUUID: str | UUID, templateId: int) -> tuple:
+        """Returns this Question's data as a row of replacements for the insert in addManyToDatabase. templateId is the id of its templateRow, see templateIds."""
+        return (
+            uuidBlob(self.uuid),
+            uuidBlob(sessionUUID),
+            templateId,
+            self.numberTries,
+            self.correct,
+            self.active,
+            self.answer,
+            self.seed
+        )
+
+    @staticmethod
+    def addManyToDatabase(databasePath: str, sessionUUID: str | UUID, questions: list) -> None:
+        """
+        Adds the data of all passed Questions (list[Question]) to the database, including contained Variables.\n
+        All rows are written with one executemany per table inside a single transaction.
+        Questions with a seed are stored in compact form, without any Variable rows.
+        """
         sql = '''
             INSERT INTO QUESTIONS (
                 QUESTION_UUID,
                 SESSION_UUID,
-                QUESTION_TYPE,
+                TEMPLATE_ID,
                 NUMBER_TRIES,
                 CORRECT,
                 ACTIVE,
-                TEXT,
-                ANSWER_VARIABLE_NAME,
-                IMAGE_FILENAME,
-                CORRECT_LEEWAY
+                ANSWER,
+                SEED
             ) VALUES (
                 ?,
                 ?,
@@ -195,32 +443,74 @@ class Question:
                 ?,
                 ?,
                 ?,
-                ?,
-                ?,
                 ?
             )
         '''
-        replacements = (
-            str(self.uuid),
-            str(sessionUUID),
-            self.questionType,
-            self.numberTries,
-            self.correct,
-            self.active,
-            self.text,
-            self.answerVariableName,
-            self.imageFilename,
-            self.correctLeeway
-        )
-        executeOnDatabase(databasePath, sql, replacements)
+        explicitQuestions = [question for question in questions if question.seed is None]
+        variables = [variable for question in explicitQuestions for variable in question.variables]
+        variableQuestionUUIDs = [question.uuid for question in explicitQuestions for _ in question.variables]
+
+        with transaction(databasePath):
+            questionRows = [
+                question.databaseRow(sessionUUID, templateId)
+                for question, templateId in zip(questions, Question.templateIds(databasePath, questions))
+            ]
+            variableRows = [
+                variable.databaseRow(questionUUID, templateId)
+                for variable, questionUUID, templateId in zip(variables, variableQuestionUUIDs, Variable.templateIds(databasePath, variables))
+            ]
+            executeManyOnDatabase(databasePath, sql, questionRows)
+            Variable.addManyToDatabase(databasePath, variableRows)
+
+        for question in questions:
+            question.markSaved()
+        return
 
-        for variable in self.variables:
-            variable.addToDatabase(databasePath, self.uuid)
-        
+    def addToDatabase(self, databasePath: str, sessionUUID: str | UUID) -> None:
+        """Adds this Questions data to the databse, including contained Variables."""
+        Question.addManyToDatabase(databasePath, sessionUUID, [self])
         return
         
-    def updateDatabase(self, databasePath: str) -> None:
-        """Updates Question data stored in database."""
+    @property
+    def trackedState(self) -> tuple[int, bool, bool]:
+        """The fields of this Question that change over the course of a Session and so need to be written back to the database: numberTries, correct, active."""
+        return (self.numberTries, bool(self.correct), bool(self.active))
+
+    @property
+    def dirty(self) -> bool:
+        """Whether numberTries, correct or active have changed since this Question was last loaded from or written to the database."""
+        return self.savedState != self.trackedState
+
+    def markSaved(self) -> None:
+        """Records the current state as matching what is stored in the database, so the Question is no longer dirty."""
+        self.savedState = self.trackedState
+        return
+
+    @staticmethod
+    def updateManyInDatabase(databasePath: str, questions: list, attempts: list = ()) -> Future:
+        """
+        Queues an update of the stored data of all passed Questions (list[Question]) on the database's DatabaseWriter, and marks them saved. The passed Attempts (list[Attempt]) are added by the same write, only if the update succeeds.\n
+        The data is copied before this returns, so the Questions can keep changing while the write is queued.
+        Returns the write's Future, which raises an IndexError if any of the Questions are no longer in the database, which happens if it has been cleared since they were loaded.
+        """
+        rows = [
+            (
+                question.numberTries,
+                question.correct,
+                question.active,
+                uuidBlob(question.uuid)
+            )
+            for question in questions
+        ]
+        # marked now, not once written, so changes made while the write is queued still count as dirty
+        for question in questions:
+            question.markSaved()
+
+        return getDatabaseWriter(databasePath).submit(partial(Question.writeUpdateRows, databasePath, rows, list(attempts)))
+
+    @staticmethod
+    def writeUpdateRows(databasePath: str, rows: list[tuple], attempts: list) -> None:
+        """Runs an update queued by updateManyInDatabase with one executemany, then adds attempts, inside a single transaction. Raises an IndexError, storing nothing, if any of the rows' Questions are no longer in the database."""
         sql = '''
             UPDATE QUESTIONS
             SET
@@ -230,195 +520,153 @@ class Question:
             WHERE
                 QUESTION_UUID=?
         '''
-        replacements = (
-            self.numberTries,
-            self.correct,
-            self.active,
-            self.uuid
-        )
-        executeOnDatabase(databasePath, sql, replacements)
-        
         # nothing in Variables changes over the course of a sesssion, don't need to update
+        with transaction(databasePath):
+            if executeManyOnDatabase(databasePath, sql, rows) != len(rows):
+                # same error as loading a cleared Session, so callers can handle both the same way
+                raise IndexError("Session has been cleared. Cannot update data.")
+            if len(attempts) > 0:
+                Attempt.addManyToDatabase(databasePath, attempts)
         return
 
+    @staticmethod
+    def recordAttempt(databasePath: str, questionUUID: str | UUID, submission: float) -> Future:
+        """
+        Queues adding one to the stored numberTries of the Question with questionUUID, and storing submission as an incorrect Attempt at it, for an incorrect submission graded without loading it.\n
+        Both are one write, so the Attempt is only stored if numberTries was. Returns the write's Future, which raises an IndexError if the Question is no longer in the database, or is no longer active.
+        """
+        attempt = Attempt(UUID(str(questionUUID)), submission, False)
+        return getDatabaseWriter(databasePath).submit(partial(Question.writeAttempt, databasePath, attempt))
+
+    @staticmethod
+    def writeAttempt(databasePath: str, attempt: Attempt) -> None:
+        """Runs a write queued by recordAttempt."""
+        sql = '''
+            UPDATE QUESTIONS
+            SET
+                NUMBER_TRIES=NUMBER_TRIES + 1
+            WHERE
+                QUESTION_UUID=?
+                AND ACTIVE
+        '''
+        if executeManyOnDatabase(databasePath, sql, [(uuidBlob(attempt.questionUUID),)]) != 1:
+            raise IndexError("Session has been cleared. Cannot update data.")
+        # the writer runs each write in its own savepoint, so raising above means nothing is stored
+        Attempt.addManyToDatabase(databasePath, [attempt])
+        return
+
+    def updateDatabase(self, databasePath: str) -> Future:
+        """Queues an update of the Question data stored in database, see updateManyInDatabase."""
+        return Question.updateManyInDatabase(databasePath, [self])
+
+    @staticmethod
+    def expandCompactInDatabase(databasePath: str) -> int:
+        """
+        Rewrites every Question stored in compact form so it is stored with a row per Variable, as if compact storage was never used.\n
+        Afterwards the Questions no longer depend on the config they were generated from, so it can be changed. That config must still be loaded when this is called.\n
+        Returns the number of Questions rewritten.
+        """
+        sql = '''
+            SELECT
+                QUESTIONS.QUESTION_UUID,
+                QUESTION_TEMPLATES.QUESTION_TYPE,
+                QUESTION_TEMPLATES.ANSWER_VARIABLE_NAME,
+                QUESTION_TEMPLATES.CORRECT_LEEWAY,
+                QUESTIONS.ANSWER,
+                QUESTIONS.SEED,
+                QUESTION_TEMPLATES.CONFIG_KEY
+            FROM QUESTIONS
+            JOIN QUESTION_TEMPLATES ON QUESTION_TEMPLATES.TEMPLATE_ID=QUESTIONS.TEMPLATE_ID
+            WHERE QUESTIONS.SEED IS NOT NULL
+        '''
+        # immediate, so no compact Questions can be added between reading and rewriting them
+        with transaction(databasePath, immediate=True):
+            questions = [
+                QUESTION_CONSTRUCTORS[row[1]](
+                    answerVariableName=row[2],
+                    variables=[],
+                    correctLeeway=row[3],
+                    text="",
+                    imageFilename="",
+                    answer=row[4],
+                    seed=row[5],
+                    configKey=row[6],
+                    uuid=UUID(bytes=row[0])
+                )
+                for row in executeOnDatabase(databasePath, sql)
+            ]
+            for question in questions:
+                question.addSeededVariables()
+
+            variables = [variable for question in questions for variable in question.variables]
+            variableQuestionUUIDs = [question.uuid for question in questions for _ in question.variables]
+            Variable.addManyToDatabase(
+                databasePath,
+                [
+                    variable.databaseRow(questionUUID, templateId)
+                    for variable, questionUUID, templateId in zip(variables, variableQuestionUUIDs, Variable.templateIds(databasePath, variables))
+                ]
+            )
+            # the template is found again because Questions stored in compact form before version 4 of the database have no text in theirs
+            sql = '''
+                UPDATE QUESTIONS
+                SET
+                    TEMPLATE_ID=?,
+                    SEED=NULL
+                WHERE
+                    QUESTION_UUID=?
+            '''
+            executeManyOnDatabase(
+                databasePath,
+                sql,
+                [
+                    (templateId, uuidBlob(question.uuid))
+                    for question, templateId in zip(questions, Question.templateIds(databasePath, questions))
+                ]
+            )
+
+        return len(questions)
+
 
 @dataclass(slots=True)
 class KinematicsQuestion(Question):
     """
     Kinematics questions with constant acceleration. Inherits all attributes from Question.\n
-    Implements properties for displacement, initial_velocity, final_velocity, time, and acceleration.
+    Implements properties for displacement, initial_velocity, final_velocity, time, and acceleration. The formulas are in SOLVERS.
     """
 
     questionType = "KinematicsQuestion"
 
-    # TODO: add source to readme
-    # derivations verified with: https://calculator-online.net/kinematics-calculator/
-
     @property
     def displacement(self) -> float:
         """Fetches or calculates the displacement variable, depending on if it is set or not."""
-        # fetch private var value set by config generation, or false if not set
-        value = self.getValue("displacement")
-
-        # if fetches value, return it
-        if type(value) is float:
-            return value
-        
-        # otherwise use equations
-        else:
-            # check if each needed var is defined
-            # will be False if not defined
-            v1 = self.getValue("initial_velocity")
-            v2 = self.getValue("final_velocity")
-            t = self.getValue("time")
-            a = self.getValue("acceleration")
-
-            # assume that enough variables are defined, find the one that isn't
-            if v1 is False:
-                # d from v2, t, a
-                return (v2 * t) - ((0.5 * a) * (t**2))
-            
-            elif v2 is False:
-                # d from v1, t, a
-                return (v1 * t) + ((0.5 * a) * (t**2))
-
-            elif t is False:
-                # d from v1, v2, a
-                return ((v2**2) - (v1**2)) / (2 * a)
-            
-            else: # a is False
-                # d from v1, v2, t formula
-                return ((v1 + v2) / 2) * t                                       
+        return self.solve("displacement")
     
     @property
     def initial_velocity(self) -> float:
-        """Fetches or calculates the displacement variable, depending on if it is set or not."""
-        # fetch private var value set by config generation, or false if not set
-        value = self.getValue("initial_velocity")
-        
-        # if fetches value, return it
-        if type(value) is float:
-            return value
-        
-        # otherwise use equations
-        else:
-            # check if each var is defined
-            # will be False if not defined
-            d = self.getValue("displacement")
-            v2 = self.getValue("final_velocity")
-            t = self.getValue("time")
-            a = self.getValue("acceleration")
-
-            # assume that enough variables are defined, find the one that isn't
-            if d is False:
-                # v1 from v2, t, a
-                return v2 - (a*t)
-            
-            elif v2 is False:
-                # v1 from d, t, a
-                return (d / t) - ((a * t) / 2)
-
-            elif t is False:
-                # v1 from d, v2, a
-                return sqrt(v2**2 - 2*a*d)
-
-            else: # a is False 
-                # v1 from d, v2, t formula
-                return ((d*2) / t) - v2
+        """Fetches or calculates the initial_velocity variable, depending on if it is set or not."""
+        return self.solve("initial_velocity")
     
     @property
     def final_velocity(self) -> float:
-        """Fetches or calculates the displacement variable, depending on if it is set or not."""
-        # fetch private var value set by config generation, or false if not set
-        value = self.getValue("final_velocity")
-        
-        # if fetches value, return it
-        if type(value) is float:
-            return value
-        
-        # otherwise use equations
-        else:
-            # check if each var is defined
-            # will be False if not defined
-            d = self.getValue("displacement")
-            v1 = self.getValue("initial_velocity")
-            t = self.getValue("time")
-            a = self.getValue("acceleration")
-
-            # assume that enough variables are defined, find the one that isn't
-            if d is False:
-                # v2 from v1, t, a
-                return (a*t) + v1
-            
-            elif v1 is False:
-                # v2 from d, t, a
-                return (d / t) + (0.5 * a * t)
-
-            elif t is False:
-                # v2 from d, v1, a
-                return sqrt(v1**2 + 2*a*d)
-
-            else: # a is False
-                # v2 from d, v1, t formula
-                return ((d*2) / t) - v1
+        """Fetches or calculates the final_velocity variable, depending on if it is set or not."""
+        return self.solve("final_velocity")
     
     @property
     def time(self) -> float:
-        """Fetches or calculates the displacement variable, depending on if it is set or not."""
-        # fetch private var value set by config generation, or false if not set
-        value = self.getValue("time")
-        
-        # if fetches value, return it
-        if type(value) is float:
-            return value
-        
-        # otherwise use equations
-        else:
-            # time relies on the other solvers instead of its own, is fine so long as the others implement all formulas
-            v1 = self.initial_velocity
-            v2 = self.final_velocity
-            a = self.acceleration
-           
-            # t from v1, v2, a, simpler formula to deal with
-            return ((v2 - v1) / a)
+        """Fetches or calculates the time variable, depending on if it is set or not."""
+        return self.solve("time")
     
     @property
     def acceleration(self) -> float:
-        """Fetches or calculates the displacement variable, depending on if it is set or not."""
-        # fetch private var value set by config generation, or false if not set
-        value = self.getValue("acceleration")
-        
-        # if fetches value, return it
-        if type(value) is float or type(value) is int:
-            return value
-        
-        # otherwise use equations
-        else:
-            # check if each var is defined
-            # will be False if not defined
-            d = self.getValue("displacement")
-            v1 = self.getValue("initial_velocity")
-            v2 = self.getValue("final_velocity")
-            t = self.getValue("time")
-
-            # assume that enough variables are defined, find the one that isn't
-            if d is False:
-                # a from v1, v2, t
-                return ((v2 - v1)/t)
-            
-            elif v1 is False:
-                # a from d, v2, t
-                return ((2 * v2) / t) - ((2 * d) / (t**2))
-
-            elif v2 is False:
-                # a from d, v1, t
-                return ((2*d) / (t**2)) - ((2*v1) / t)
-
-            else: # t is False
-                # a from d, v1, v2 formula
-                return ((v2**2 - v1**2) / (2 * d))
+        """Fetches or calculates the acceleration variable, depending on if it is set or not."""
+        return self.solve("acceleration")
 
 # this is where new constructors/question types need to be added to function correctly
 QUESTION_CONSTRUCTORS = {
     "KinematicsQuestion": KinematicsQuestion
 }
+
+# every QuestionConfig that has been loaded, keyed by configKey, so Questions stored in compact form can find the config to draw their Variables from
+# filled in by QuestionConfig when it is created
+QUESTION_CONFIGS = {}
@@ -0,0 +1,79 @@
+from dataclasses import dataclass
+from functools import cache
+from math import sqrt
+from typing import Callable, Mapping
+
+
+@dataclass(frozen=True, slots=True)
+class Solver:
+    """
+    A single formula for one variable of a question type.\n
+    Attributes:\n
+        variableNames (tuple[str, ...]): the variables the formula needs, in the order it takes them,\n
+        formula (Callable[..., float]): takes the values of variableNames as positional arguments and returns the solved value
+    """
+    variableNames: tuple[str, ...]
+    formula: Callable[..., float]
+
+    def __call__(self, values: Mapping[str, float]) -> float:
+        """Solves using the values in values (variable name to value), which needs to contain every name in variableNames."""
+        return self.formula(*[values[name] for name in self.variableNames])
+
+
+# the formulas for each variable of each question type, keyed by questionType and then by the name of the variable they solve for
+# the first formula whose variables are all known is used, so list them in order of preference
+# new question types need to add their formulas here, and to QUESTION_CONSTRUCTORS
+SOLVERS: dict[str, dict[str, list[Solver]]] = {
+    # derivations verified with: https://calculator-online.net/kinematics-calculator/
+    "KinematicsQuestion": {
+        "displacement": [
+            Solver(("final_velocity", "time", "acceleration"), lambda v2, t, a: (v2 * t) - ((0.5 * a) * (t**2))),
+            Solver(("initial_velocity", "time", "acceleration"), lambda v1, t, a: (v1 * t) + ((0.5 * a) * (t**2))),
+            Solver(("initial_velocity", "final_velocity", "acceleration"), lambda v1, v2, a: ((v2**2) - (v1**2)) / (2 * a)),
+            Solver(("initial_velocity", "final_velocity", "time"), lambda v1, v2, t: ((v1 + v2) / 2) * t)
+        ],
+        "initial_velocity": [
+            Solver(("final_velocity", "time", "acceleration"), lambda v2, t, a: v2 - (a*t)),
+            Solver(("displacement", "time", "acceleration"), lambda d, t, a: (d / t) - ((a * t) / 2)),
+            Solver(("displacement", "final_velocity", "acceleration"), lambda d, v2, a: sqrt(v2**2 - 2*a*d)),
+            Solver(("displacement", "final_velocity", "time"), lambda d, v2, t: ((d*2) / t) - v2)
+        ],
+        "final_velocity": [
+            Solver(("initial_velocity", "time", "acceleration"), lambda v1, t, a: (a*t) + v1),
+            Solver(("displacement", "time", "acceleration"), lambda d, t, a: (d / t) + (0.5 * a * t)),
+            Solver(("displacement", "initial_velocity", "acceleration"), lambda d, v1, a: sqrt(v1**2 + 2*a*d)),
+            Solver(("displacement", "initial_velocity", "time"), lambda d, v1, t: ((d*2) / t) - v1)
+        ],
+        # time is always (v2 - v1) / a, with whichever of those is unknown solved by its own formula above
+        "time": [
+            Solver(("initial_velocity", "final_velocity", "acceleration"), lambda v1, v2, a: (v2 - v1) / a),
+            Solver(("displacement", "final_velocity", "acceleration"), lambda d, v2, a: (v2 - sqrt(v2**2 - 2*a*d)) / a),
+            Solver(("displacement", "initial_velocity", "acceleration"), lambda d, v1, a: (sqrt(v1**2 + 2*a*d) - v1) / a),
+            Solver(("displacement", "initial_velocity", "final_velocity"), lambda d, v1, v2: (v2 - v1) / ((v2**2 - v1**2) / (2 * d)))
+        ],
+        "acceleration": [
+            Solver(("initial_velocity", "final_velocity", "time"), lambda v1, v2, t: (v2 - v1)/t),
+            Solver(("displacement", "final_velocity", "time"), lambda d, v2, t: ((2 * v2) / t) - ((2 * d) / (t**2))),
+            Solver(("displacement", "initial_velocity", "time"), lambda d, v1, t: ((2*d) / (t**2)) - ((2*v1) / t)),
+            Solver(("displacement", "initial_velocity", "final_velocity"), lambda d, v1, v2: ((v2**2 - v1**2) / (2 * d)))
+        ]
+    }
+}
+
+@cache
+def getSolver(questionType: str, knownVariableNames: frozenset[str], answerVariableName: str) -> Solver:
+    """
+    Returns the Solver from SOLVERS that finds answerVariableName for questionType using only the knownVariableNames.\n
+    Results are cached, so each combination is only searched for once.\n
+    Raises a ValueError if there is no such formula.
+    """
+    try:
+        solvers = SOLVERS[questionType][answerVariableName]
+    except KeyError:
+        raise ValueError(f"{questionType} has no variable {answerVariableName} to solve for. See question types docs for valid variables.")
+
+    for solver in solvers:
+        if knownVariableNames.issuperset(solver.variableNames):
+            return solver
+
+    raise ValueError(f"{questionType} cannot solve for {answerVariableName} from {', '.join(sorted(knownVariableNames))}. See question types docs for valid variables.")
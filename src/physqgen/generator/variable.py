@@ -1,8 +1,11 @@
 from dataclasses import InitVar, dataclass, field
-from random import random
+from itertools import repeat
+from os import urandom
+from random import Random, random
 from uuid import UUID, uuid4
 
-from physqgen.database import executeOnDatabase
+from physqgen.database import (executeManyOnDatabase, executeOnDatabase,
+                               transaction, uuidBlob)
 from physqgen.generator.config.variable import VariableConfig
 
 # the methods to use on each type of variable to determine whether they are valid
@@ -24,6 +27,26 @@ RELATIVE_VERIFICATION_METHODS = {
 }
 
 
+def randomUUIDs(number: int) -> list[UUID]:
+    """Returns number random (version 4) UUIDs, the same as calling uuid4 number times, but reading the random bytes for all of them at once."""
+    randomBytes = urandom(16 * number)
+    uuids = []
+    for start in range(0, 16 * number, 16):
+        value = int.from_bytes(randomBytes[start:start + 16])
+        # set the variant and version bits, as UUID(version=4) does
+        value &= ~(0xc000 << 48)
+        value |= 0x8000 << 48
+        value &= ~(0xf000 << 64)
+        value |= 4 << 76
+        uuids.append(UUID(int=value))
+    return uuids
+
+def randomSeeds(number: int) -> list[int]:
+    """Returns number random seeds for Variable.seededValues, reading the random bytes for all of them at once. Each fits in a signed 64 bit sqlite INTEGER."""
+    randomBytes = urandom(8 * number)
+    return [int.from_bytes(randomBytes[start:start + 8]) >> 1 for start in range(0, 8 * number, 8)]
+
+
 @dataclass(slots=True)
 class Variable:
     """
@@ -64,6 +87,25 @@ class Variable:
         """Returna a randomized value within the given range."""
         return range[0] + random() * (range[1] - range[0])
 
+    @staticmethod
+    def randomizeValues(range: tuple[float | int, float | int], number: int) -> list[float]:
+        """Returns a list of number randomized values within the given range, drawn the same way as randomizeValue."""
+        low = range[0]
+        span = range[1] - range[0]
+        return [low + random() * span for _ in repeat(None, number)]
+
+    @staticmethod
+    def seededValues(variableConfigs: tuple[VariableConfig, ...], seed: int) -> list[float]:
+        """
+        Returns a value for each of variableConfigs, in order, randomized within its range by a generator seeded with seed.\n
+        The same seed and configs always give the same values, so only the seed needs to be stored to get them again.
+        """
+        generator = Random(seed)
+        return [
+            variableConfig.range[0] + generator.random() * (variableConfig.range[1] - variableConfig.range[0])
+            for variableConfig in variableConfigs
+        ]
+
     def __str__(self) -> str:
         """Assembles the variable as it should be displayed to a student, with its value to the correct decimal places, units, and correct display variable name."""
         return f"{self.displayName} = {self.value:.{self.decimalPlaces}f} {self.units}"
@@ -73,14 +115,16 @@ class Variable:
         """Fetches the variable stored in the database with the given variableUUID and returns an instance of cls populated with it."""
         sql = '''
             SELECT
-                VARIABLE_NAME,
-                VALUE,
-                UNITS,
-                DISPLAY_NAME,
-                DECIMAL_PLACES
-            FROM VARIABLES WHERE VARIABLE_UUID=?
+                VARIABLE_TEMPLATES.VARIABLE_NAME,
+                VARIABLES.VALUE,
+                VARIABLE_TEMPLATES.UNITS,
+                VARIABLE_TEMPLATES.DISPLAY_NAME,
+                VARIABLE_TEMPLATES.DECIMAL_PLACES
+            FROM VARIABLES
+            JOIN VARIABLE_TEMPLATES ON VARIABLE_TEMPLATES.VARIABLE_TEMPLATE_ID=VARIABLES.VARIABLE_TEMPLATE_ID
+            WHERE VARIABLES.VARIABLE_UUID=?
         '''
-        replacements = (str(variableUUID),)
+        replacements = (uuidBlob(variableUUID),)
         # index 0 is the first (and only) row that met the criteria
         # will error if the database has been cleared since the session was created
         # let it error to prevent other issues
@@ -97,8 +141,33 @@ class Variable:
         )
     
     @classmethod
-    def fromConfig(cls, variableConfig: VariableConfig, questionConfig):
-        """Generates a Variable with random value based on the passed VariableConfig, using questionConfig (a QuestionConfig) for more context for some verification."""
+    def fromConfig(cls, variableConfig: VariableConfig):
+        """Generates a Variable with random value based on the passed VariableConfig. The config is verified when it is loaded, see QuestionConfig."""
+        return cls(
+            range=variableConfig.range,
+            variableName=variableConfig.variableName,
+            units=variableConfig.units,
+            displayName=variableConfig.displayName,
+            decimalPlaces=variableConfig.decimalPlaces
+        )
+
+    @classmethod
+    def manyFromSeed(cls, variableConfigs: tuple[VariableConfig, ...], seed: int) -> list:
+        """Generates a Variable (list[Variable]) for each of variableConfigs, with the values given by seededValues for seed."""
+        return [
+            cls(
+                variableName=variableConfig.variableName,
+                value=value,
+                units=variableConfig.units,
+                displayName=variableConfig.displayName,
+                decimalPlaces=variableConfig.decimalPlaces
+            )
+            for variableConfig, value in zip(variableConfigs, cls.seededValues(variableConfigs, seed))
+        ]
+
+    @staticmethod
+    def verifyConfig(variableConfig: VariableConfig, questionConfig) -> None:
+        """Raises a ValueError if variableConfig fails its VERIFICATION_METHODS, or its RELATIVE_VERIFICATION_METHODS in the context of the other VariableConfigs in questionConfig (a QuestionConfig)."""
         # verify any variables with verification set up
         try:
             if not VERIFICATION_METHODS[questionConfig.questionType][variableConfig.variableName](variableConfig):
@@ -138,22 +207,33 @@ class Variable:
                     if not func(variableConfig, *contextVarConfigs):
                         raise ValueError(f"Configuration for {variableConfig.variableName} ({variableConfig}) did not pass contextual verification. That means that in context of the other supplied configurations, it is invalid. See question type docs for valid states.")
         
-        return cls(
-            range=variableConfig.range,
-            variableName=variableConfig.variableName,
-            units=variableConfig.units,
-            displayName=variableConfig.displayName,
-            decimalPlaces=variableConfig.decimalPlaces
-        )
+        return
     
-    def addToDatabase(self, databasePath: str, questionUUID: str | UUID) -> None:
-        """Add this Variables data to the database."""
-        sql = '''
-            INSERT INTO VARIABLES (
-                VARIABLE_UUID,
-                QUESTION_UUID,
+    @property
+    def templateRow(self) -> tuple:
+        """The data of this Variable that is the same for every student given its question, stored once in VARIABLE_TEMPLATES. See templateIds."""
+        return (
+            self.variableName,
+            self.units,
+            self.displayName,
+            self.decimalPlaces
+        )
+
+    @staticmethod
+    def templateIds(databasePath: str, variables: list) -> list[int]:
+        """Returns the id of the row in VARIABLE_TEMPLATES matching the templateRow of each of the passed Variables (list[Variable]), adding any that aren't stored yet. Should be called inside a transaction."""
+        selectSQL = '''
+            SELECT VARIABLE_TEMPLATE_ID
+            FROM VARIABLE_TEMPLATES
+            WHERE
+                VARIABLE_NAME=?
+                AND UNITS=?
+                AND DISPLAY_NAME=?
+                AND DECIMAL_PLACES=?
+        '''
+        insertSQL = '''
+            INSERT INTO VARIABLE_TEMPLATES (
                 VARIABLE_NAME,
-                VALUE,
                 UNITS,
                 DISPLAY_NAME,
                 DECIMAL_PLACES
@@ -161,22 +241,51 @@ class Variable:
                 ?,
                 ?,
                 ?,
+                ?
+            ) RETURNING VARIABLE_TEMPLATE_ID
+        '''
+        # every student's copy of a question shares the same templates, look each up once
+        templateIds: dict[tuple, int] = {}
+        for variable in variables:
+            templateRow = variable.templateRow
+            if templateRow not in templateIds:
+                results = executeOnDatabase(databasePath, selectSQL, templateRow)
+                if len(results) == 0:
+                    results = executeOnDatabase(databasePath, insertSQL, templateRow)
+                templateIds[templateRow] = results[0][0]
+
+        return [templateIds[variable.templateRow] for variable in variables]
+
+    def databaseRow(self, questionUUID: str | UUID, templateId: int) -> tuple:
+        """Returns this Variable's data as a row of replacements for the insert in addManyToDatabase. templateId is the id of its templateRow, see templateIds."""
+        return (
+            uuidBlob(self.uuid),
+            uuidBlob(questionUUID),
+            templateId,
+            self.value
+        )
+
+    @staticmethod
+    def addManyToDatabase(databasePath: str, rows: list[tuple]) -> None:
+        """Adds the Variable data in rows, each created by databaseRow, to the database with a single executemany."""
+        sql = '''
+            INSERT INTO VARIABLES (
+                VARIABLE_UUID,
+                QUESTION_UUID,
+                VARIABLE_TEMPLATE_ID,
+                VALUE
+            ) VALUES (
                 ?,
                 ?,
                 ?,
                 ?
             )
         '''
-        replacements = (
-            str(self.uuid),
-            str(questionUUID),
-            self.variableName,
-            self.value,
-            self.units,
-            self.displayName,
-            self.decimalPlaces
-        )
-        executeOnDatabase(databasePath, sql, replacements)
+        executeManyOnDatabase(databasePath, sql, rows)
+        return
 
+    def addToDatabase(self, databasePath: str, questionUUID: str | UUID) -> None:
+        """Add this Variables data to the database."""
+        with transaction(databasePath):
+            Variable.addManyToDatabase(databasePath, [self.databaseRow(questionUUID, Variable.templateIds(databasePath, [self])[0])])
         return
- 
\ No newline at end of file
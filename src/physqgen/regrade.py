@@ -0,0 +1,168 @@
+from dataclasses import dataclass, replace
+
+from physqgen.database import (executeManyOnDatabase, executeOnDatabase,
+                               transaction, uuidBlob)
+from physqgen.generator import Config
+from physqgen.generator.question import Question
+from physqgen.generator.solvers import getSolver
+
+
+@dataclass(slots=True)
+class RegradeSummary:
+    """
+    What regradeDatabase changed.\n
+    Attributes:\n
+        templates (int): number of stored questions whose correctLeeway was changed to match the config,\n
+        answers (int): number of Questions whose answer changed when solved again,\n
+        attempts (int): number of Attempts whose correctness changed,\n
+        questions (int): number of Questions whose correctness changed
+    """
+    templates: int = 0
+    answers: int = 0
+    attempts: int = 0
+    questions: int = 0
+
+
+def applyConfigLeeways(databasePath: str, config: Config) -> int:
+    """
+    Sets the correctLeeway of every stored question template to that of the QuestionConfig in config with the same questionType, answerVariableName, text and imageFilename.\n
+    If the rest of the template's config is unchanged too, its configKey is updated, so Questions stored in compact form still load with the new config.
+    Returns the number of templates changed.
+    """
+    sql = '''
+        SELECT
+            TEMPLATE_ID,
+            CORRECT_LEEWAY,
+            CONFIG_KEY
+        FROM QUESTION_TEMPLATES
+        WHERE
+            QUESTION_TYPE=?
+            AND ANSWER_VARIABLE_NAME=?
+            AND TEXT=?
+            AND IMAGE_FILENAME=?
+            AND CORRECT_LEEWAY!=?
+    '''
+    rows = []
+    for questionConfig in config.questionConfigs:
+        replacements = (
+            questionConfig.questionType,
+            questionConfig.answerVariableName.lower(),
+            questionConfig.text,
+            questionConfig.imageFilename,
+            questionConfig.correctLeeway
+        )
+        for templateId, correctLeeway, configKey in executeOnDatabase(databasePath, sql, replacements):
+            # the key the config would have had, if only correctLeeway was changed since the template was stored
+            if configKey == replace(questionConfig, correctLeeway=correctLeeway).configKey:
+                configKey = questionConfig.configKey
+            rows.append((questionConfig.correctLeeway, configKey, templateId))
+
+    sql = '''
+        UPDATE QUESTION_TEMPLATES
+        SET
+            CORRECT_LEEWAY=?,
+            CONFIG_KEY=?
+        WHERE
+            TEMPLATE_ID=?
+    '''
+    executeManyOnDatabase(databasePath, sql, rows)
+    return len(rows)
+
+def recomputeAnswers(databasePath: str) -> int:
+    """
+    Solves the answer of every stored Question again from its other Variables, with the formulas currently in SOLVERS, and stores any that changed.\n
+    Questions stored in compact form need the config they were generated from to be loaded. Returns the number of answers changed.
+    """
+    questionRows = []
+    variableRows = []
+    for question in Question.manyFromDatabase(databasePath, None):
+        # the answer Variable's name isn't lowercased like answerVariableName, see Question.fromConfig
+        knownValues = {
+            variable.variableName: variable.value
+            for variable in question.variables if variable.variableName.lower() != question.answerVariableName
+        }
+        answer = getSolver(question.questionType, frozenset(knownValues), question.answerVariableName)(knownValues)
+        if answer == question.answer:
+            continue
+
+        questionRows.append((answer, uuidBlob(question.uuid)))
+        # compact Questions have no stored Variables, their answer Variable is made from ANSWER when loaded
+        if question.seed is None:
+            for variable in question.variables:
+                if variable.variableName.lower() == question.answerVariableName:
+                    variableRows.append((answer, uuidBlob(variable.uuid)))
+
+    executeManyOnDatabase(databasePath, "UPDATE QUESTIONS SET ANSWER=? WHERE QUESTION_UUID=?", questionRows)
+    executeManyOnDatabase(databasePath, "UPDATE VARIABLES SET VALUE=? WHERE VARIABLE_UUID=?", variableRows)
+    return len(questionRows)
+
+def regradeAttempts(databasePath: str) -> int:
+    """
+    Grades every stored Attempt again against its Question's stored answer and correctLeeway, the same way as Question.checkSubmission, and stores any that changed.\n
+    Every Attempt is loaded as columns with one query and graded in one pass. Returns the number of Attempts changed.
+    """
+    sql = '''
+        SELECT
+            ATTEMPTS.rowid,
+            ATTEMPTS.VALUE,
+            ATTEMPTS.CORRECT,
+            QUESTIONS.ANSWER,
+            QUESTION_TEMPLATES.CORRECT_LEEWAY
+        FROM ATTEMPTS
+        JOIN QUESTIONS ON QUESTIONS.QUESTION_UUID=ATTEMPTS.QUESTION_UUID
+        JOIN QUESTION_TEMPLATES ON QUESTION_TEMPLATES.TEMPLATE_ID=QUESTIONS.TEMPLATE_ID
+    '''
+    results = executeOnDatabase(databasePath, sql)
+    if len(results) == 0:
+        return 0
+
+    rowids, values, storedCorrect, answers, correctLeeways = zip(*results)
+    correct = map(Question.withinLeeway, answers, correctLeeways, values)
+    rows = [
+        (newCorrect, rowid)
+        for rowid, oldCorrect, newCorrect in zip(rowids, storedCorrect, correct) if bool(oldCorrect) != newCorrect
+    ]
+
+    executeManyOnDatabase(databasePath, "UPDATE ATTEMPTS SET CORRECT=? WHERE rowid=?", rows)
+    return len(rows)
+
+def updateProgress(databasePath: str) -> int:
+    """
+    Marks each Question with any Attempts as correct if and only if one of them is, then makes the first incorrect Question of every Session its active one, as Session.setNewActiveQuestion does.\n
+    Questions without Attempts (answered before they were recorded) keep their correctness. Returns the number of Questions whose correctness changed.
+    """
+    sql = '''
+        UPDATE QUESTIONS
+        SET CORRECT=(SELECT MAX(ATTEMPTS.CORRECT) FROM ATTEMPTS WHERE ATTEMPTS.QUESTION_UUID=QUESTIONS.QUESTION_UUID)
+        WHERE
+            QUESTION_UUID IN (SELECT QUESTION_UUID FROM ATTEMPTS)
+            AND CORRECT IS NOT (SELECT MAX(ATTEMPTS.CORRECT) FROM ATTEMPTS WHERE ATTEMPTS.QUESTION_UUID=QUESTIONS.QUESTION_UUID)
+        RETURNING QUESTION_UUID
+    '''
+    changed = len(executeOnDatabase(databasePath, sql))
+
+    # IS, so Sessions with every Question correct have none active
+    sql = '''
+        UPDATE QUESTIONS
+        SET ACTIVE=(
+            rowid IS (SELECT MIN(OTHER.rowid) FROM QUESTIONS AS OTHER WHERE OTHER.SESSION_UUID=QUESTIONS.SESSION_UUID AND NOT OTHER.CORRECT)
+        )
+    '''
+    executeOnDatabase(databasePath, sql)
+    return changed
+
+def regradeDatabase(databasePath: str, config: Config | None = None) -> RegradeSummary:
+    """
+    Re-evaluates all past work as one transaction, for after a solver is fixed or correctLeeway is changed in the config.\n
+    Applies the correctLeeways in config (if it isn't None), solves every answer again, grades every Attempt again, and updates each Question's correctness and each Session's active Question to match.
+    The server should not be running, it would keep using the Sessions it has in memory.
+    """
+    summary = RegradeSummary()
+    # immediate, so nothing can be written between reading and rewriting
+    with transaction(databasePath, immediate=True):
+        if config is not None:
+            summary.templates = applyConfigLeeways(databasePath, config)
+        summary.answers = recomputeAnswers(databasePath)
+        summary.attempts = regradeAttempts(databasePath)
+        summary.questions = updateProgress(databasePath)
+    return summary
@@ -1,7 +1,10 @@
+from concurrent.futures import Future
 from dataclasses import dataclass, field
 from uuid import UUID, uuid4
 
-from physqgen.database import executeOnDatabase
+from physqgen.attempt import Attempt
+from physqgen.database import (executeOnDatabase, getDatabaseWriter,
+                               transaction, uuidBlob)
 from physqgen.generator.question import Question
 
 
@@ -28,7 +31,7 @@ class LoginInfo:
                 EMAIL
             FROM SESSIONS WHERE SESSION_UUID=?
         '''
-        replacements = (str(sessionUUID),)
+        replacements = (uuidBlob(sessionUUID),)
         # index 0 is the first (and only) row that met the criteria
         # will error if the database has been cleared since the session was created
         # let it error to prevent other issues
@@ -89,30 +92,22 @@ class Session:
     
     @staticmethod
     def getAllQuestions(databasePath: str, sessionUUID: str) -> list[Question]:
-        """Constructs a list of all the Question subclass instances in the database which corespond to the passed sessionUUID."""
-        sql = '''SELECT QUESTION_UUID FROM QUESTIONS WHERE SESSION_UUID=?'''
-        replacements = (sessionUUID,)
-        results = executeOnDatabase(databasePath, sql, replacements)
-        if len(results) == 0:
+        """Constructs a list of all the Question subclass instances in the database which corespond to the passed sessionUUID, using one joined query."""
+        questions = Question.manyFromDatabase(databasePath, "SESSION_UUID", sessionUUID)
+        if len(questions) == 0:
             # could happen if the database has been cleared since creation
             # should error on other things first, but check just in case
             # because this should never run, don't include it in docstring
             raise RuntimeError("Session has been cleared. Cannot load data.")
 
-        questions = []
-        for uuid in results:
-            # return value is a tuple containing only the uuid
-            uuid = uuid[0]
-            questions.append(Question.fromDatabase(databasePath, uuid))
-
         return questions
     
     @classmethod
     def fromDatabase(cls, databasePath: str, sessionUUID: str):
-        """Recreates an existing Session object. Will raise an IndexError if session data has been cleared."""
+        """Recreates an existing Session object with two queries, one for the LoginInfo and one for all Questions and their Variables. Will raise an IndexError if session data has been cleared."""
         return cls(
             databasePath=databasePath,
-            uuid=sessionUUID,
+            uuid=UUID(str(sessionUUID)),
             loginInfo=LoginInfo.fromDatabase(databasePath, sessionUUID),
             questions=Session.getAllQuestions(databasePath, sessionUUID),
         )
@@ -126,9 +121,22 @@ class Session:
         else:
             return False
     
-    def addToDatabase(self) -> None:
-        """Add this Session's data to the database, including contained Questions and Variables. Only works if is not already in database."""
-        # commit self
+    def addToDatabase(self) -> Future:
+        """Queues adding this Session's data to the database on its DatabaseWriter, and returns the write's Future. See writeToDatabase. Only works if is not already in database."""
+        return getDatabaseWriter(self.databasePath).submit(self.writeToDatabase)
+
+    def writeToDatabase(self) -> None:
+        """Adds this Session's data to the database, including contained Questions and Variables, as one transaction with one bulk insert per table. Only works if is not already in database."""
+        with transaction(self.databasePath):
+            self.addLoginInfoToDatabase()
+
+            # commit questions. their variables are committed with them
+            Question.addManyToDatabase(self.databasePath, self.uuid, self.questions)
+
+        return
+
+    def addLoginInfoToDatabase(self) -> None:
+        """Adds only this Session's uuid and LoginInfo to the database. Used on its own for Sessions whose Questions were stored ahead of time, see QuestionSetPool."""
         sql = '''
             INSERT INTO SESSIONS (
                 SESSION_UUID,
@@ -143,29 +151,26 @@ class Session:
             )
         '''
         replacements = (
-            str(self.uuid),
+            uuidBlob(self.uuid),
             self.loginInfo.firstName,
             self.loginInfo.lastName,
             self.loginInfo.email
         )
         executeOnDatabase(self.databasePath, sql, replacements)
-
-        # commit questions. they will commit their own variables
-        for question in self.questions:
-            question.addToDatabase(self.databasePath, self.uuid)
-
         return
 
-    def update(self, submission: float) -> None:
+    def update(self, submission: float) -> Future | None:
         """
         Update Session and activeQuestion based on contents of submission.\n
         Adds one to activeQuestion's numberTries.\n
-        Checks submission and updates activeQuestion as needed.\n
-        Updates database with new info before returning.
+        Checks submission and updates activeQuestion as needed, and records it as an Attempt.\n
+        Queues an update of the database with the new info, including the Attempt, before returning. Returns the update's Future, which raises an IndexError if session data has been cleared.
         """
         self.activeQuestion.numberTries += 1
 
         self.activeQuestion.correct = self.activeQuestion.checkSubmission(submission)
+        # stored by the same write as the update below, so it is only stored if the new numberTries is
+        attempt = Attempt(self.activeQuestion.uuid, submission, self.activeQuestion.correct)
 
         if self.activeQuestion.correct:
             self.activeQuestion.active = False
@@ -174,12 +179,15 @@ class Session:
             # if not possible, ignore, as that means all questions are complete
             self.setNewActiveQuestion()
 
-        self.updateDatabase()
-        return
+        return self.updateDatabase([attempt])
     
-    def updateDatabase(self) -> None:
-        """Updates Session data, including Questions, stored in database."""
-        for question in self.questions:
-            question.updateDatabase(self.databasePath)
+    def updateDatabase(self, attempts: list = ()) -> Future | None:
+        """
+        Queues an update of the Session data stored in database, writing only the Questions that have changed since they were loaded, and adding the passed Attempts (list[Attempt]), as one transaction.\n
+        Returns the update's Future, which raises an IndexError if session data has been cleared, in which case none of it is stored, or None if there was nothing to write.
+        """
+        dirtyQuestions = [question for question in self.questions if question.dirty]
+        if len(dirtyQuestions) == 0 and len(attempts) == 0:
+            return None
 
-        return
+        return Question.updateManyInDatabase(self.databasePath, dirtyQuestions, attempts)